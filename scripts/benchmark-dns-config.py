@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+DNS Config Generator Benchmark
+
+Generates synthetic repositories with many route manifests and times the
+phases of generate-dns-config.py against them. Results are compared with a
+JSON baseline so performance regressions are caught.
+
+Usage:
+    ./scripts/benchmark-dns-config.py                        # 1k and 10k manifests
+    ./scripts/benchmark-dns-config.py --sizes 1000,10000,100000
+    ./scripts/benchmark-dns-config.py --update-baseline      # Record new baseline
+    ./scripts/benchmark-dns-config.py --max-regression 1.5   # Fail if >50% slower
+
+Synthetic manifests mirror the real tree: multi-document files (Service,
+Deployment and HTTPRoute), a shared Gateway, duplicate hostnames across
+files, and apps spread over every output category.
+
+The baseline is machine-specific, so it lives in .cache/ by default rather
+than in git.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Directory layout -> category, mirroring get_category_from_path()
+CATEGORY_DIRS = [
+    "kubernetes/apps/base/ai",
+    "kubernetes/apps/base/arr-stack",
+    "kubernetes/apps/base/tools",
+    "kubernetes/apps/base/media",
+    "kubernetes/infrastructure/configs",
+]
+
+# Every Nth app reuses an earlier hostname, every Mth also gets a second suffix
+DUPLICATE_EVERY = 20
+MULTI_HOSTNAME_EVERY = 7
+
+GATEWAY_MANIFEST = """\
+# Synthetic Gateway
+---
+apiVersion: gateway.networking.k8s.io/v1
+kind: Gateway
+metadata:
+  name: cilium-gateway
+  namespace: kube-system
+spec:
+  gatewayClassName: cilium
+  infrastructure:
+    annotations:
+      io.cilium/lb-ipam-ips: "10.10.2.20"
+  listeners:
+    - name: https
+      protocol: HTTPS
+      port: 443
+      hostname: "*.home-infra.net"
+"""
+
+APP_MANIFEST = """\
+# {app} manifests (synthetic)
+---
+apiVersion: v1
+kind: Service
+metadata:
+  name: {app}
+  namespace: {namespace}
+  labels:
+    app.kubernetes.io/name: {app}
+spec:
+  type: ClusterIP
+  ports:
+    - name: http
+      port: 80
+      targetPort: 8080
+  selector:
+    app.kubernetes.io/name: {app}
+---
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: {app}
+  namespace: {namespace}
+spec:
+  replicas: 1
+  selector:
+    matchLabels:
+      app.kubernetes.io/name: {app}
+  template:
+    metadata:
+      labels:
+        app.kubernetes.io/name: {app}
+    spec:
+      containers:
+        - name: {app}
+          image: ghcr.io/example/{app}:1.0.0
+          ports:
+            - containerPort: 8080
+          resources:
+            requests:
+              cpu: 10m
+              memory: 64Mi
+---
+apiVersion: gateway.networking.k8s.io/v1
+kind: HTTPRoute
+metadata:
+  name: {app}
+  namespace: {namespace}
+spec:
+  parentRefs:
+    - name: cilium-gateway
+      namespace: kube-system
+  hostnames:
+{hostnames}
+  rules:
+    - matches:
+        - path:
+            type: PathPrefix
+            value: /
+      backendRefs:
+        - name: {app}
+          port: 80
+"""
+
+
+def load_generator(repo_root: Path):
+    """Import scripts/generate-dns-config.py as a module."""
+    path = repo_root / "scripts" / "generate-dns-config.py"
+    spec = importlib.util.spec_from_file_location("generate_dns_config", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def find_repo_root() -> Path:
+    """Find the repository root by looking for .git directory."""
+    current = Path(__file__).resolve().parent
+    while current != current.parent:
+        if (current / ".git").exists():
+            return current
+        current = current.parent
+    return Path(__file__).resolve().parent.parent
+
+
+def build_synthetic_repo(root: Path, count: int) -> None:
+    """Write count app manifests (plus one Gateway) under root."""
+    gateway_dir = root / "kubernetes/infrastructure/gateway"
+    gateway_dir.mkdir(parents=True)
+    (gateway_dir / "gateway.yaml").write_text(GATEWAY_MANIFEST)
+
+    for index in range(count):
+        app = f"app{index:06d}"
+        category_dir = CATEGORY_DIRS[index % len(CATEGORY_DIRS)]
+        namespace = category_dir.rsplit("/", 1)[-1]
+
+        hostname = f"{app}.home-infra.net"
+        if index and index % DUPLICATE_EVERY == 0:
+            hostname = f"app{index - 1:06d}.home-infra.net"
+        hostnames = [hostname]
+        if index % MULTI_HOSTNAME_EVERY == 0:
+            hostnames.append(f"{app}.reynoza.org")
+
+        app_dir = root / category_dir / app
+        app_dir.mkdir(parents=True)
+        # Alternate between the two naming styles used in the real tree
+        filename = "httproute.yaml" if index % 2 else f"{app}-httproute.yaml"
+        (app_dir / filename).write_text(APP_MANIFEST.format(
+            app=app,
+            namespace=namespace,
+            hostnames="\n".join(f"    - {h}" for h in hostnames),
+        ))
+
+
+def measure(func, repeat: int) -> tuple[float, object]:
+    """Return (best wall time in seconds, last result) over repeat calls."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_size(gen, count: int, repeat: int, workdir: Path) -> dict[str, float]:
+    """Benchmark every generator phase against a synthetic repo of count apps."""
+    root = workdir / f"repo-{count}"
+    print(f"\nGenerating synthetic repo with {count} manifests...")
+    build_synthetic_repo(root, count)
+    files, _ = gen.discover_manifests(root, "walk")
+
+    results = {}
+    results["scan_httproutes"], _ = measure(
+        lambda: gen.scan_httproutes(root, files=files), repeat
+    )
+
+    cache = gen.ScanCache(root / gen.SCAN_CACHE_PATH)
+    gen.scan_httproutes(root, cache=cache, files=files)
+    results["scan_httproutes_cached"], _ = measure(
+        lambda: gen.scan_httproutes(root, cache=cache, files=files), repeat
+    )
+
+    results["build_service_registry"], services = measure(
+        lambda: gen.build_service_registry(root, files=files), repeat
+    )
+    results["generate_controld_config"], controld = measure(
+        lambda: gen.generate_controld_config(services), repeat
+    )
+    results["generate_pangolin_config"], _ = measure(
+        lambda: gen.generate_pangolin_config(services), repeat
+    )
+
+    def stream_both():
+        groups = gen.group_by_category(services)
+        with open(os.devnull, "w", buffering=gen.WRITE_BUFFER_SIZE) as handle:
+            for preamble, render_lines in (
+                (gen.CONTROLD_PREAMBLE, gen.iter_controld_lines),
+                (gen.PANGOLIN_PREAMBLE, gen.iter_pangolin_lines),
+            ):
+                digest = gen.payload_lines_digest(render_lines(groups))
+                gen.write_config(handle, preamble, render_lines(groups), digest)
+
+    results["stream_render_both"], _ = measure(stream_both, repeat)
+
+    # Diff against a "current" file missing ~1% of services
+    current = gen.generate_controld_config(
+        [svc for index, svc in enumerate(services) if index % 100]
+    )
+
+    def run_diff():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return gen.show_diff(current, controld, "domains.yaml")
+
+    results["show_diff"], _ = measure(run_diff, repeat)
+
+    domains = gen.build_registry(services)["domains"]
+    results["semantic_diff"], _ = measure(
+        lambda: gen.semantic_diff(current, domains, "domains"), repeat
+    )
+
+    shutil.rmtree(root)
+    return results
+
+
+def print_results(results: dict, baseline: dict | None, max_regression: float) -> list[str]:
+    """Print a results table and return the names of regressed measurements."""
+    regressions = []
+    print(f"\n{'Manifests':>9}  {'Measurement':<26} {'Time':>11} {'Baseline':>11} {'Ratio':>7}")
+    print("-" * 70)
+    for size, timings in results.items():
+        for name, seconds in timings.items():
+            base = (baseline or {}).get(size, {}).get(name)
+            ratio = seconds / base if base else None
+            flag = ""
+            if ratio is not None and ratio > max_regression:
+                flag = "  REGRESSION"
+                regressions.append(f"{size}/{name}")
+            base_str = f"{base * 1000:>8.1f} ms" if base else f"{'-':>11}"
+            ratio_str = f"{ratio:>6.2f}x" if ratio is not None else f"{'-':>7}"
+            print(f"{size:>9}  {name:<26} {seconds * 1000:>8.1f} ms {base_str} {ratio_str}{flag}")
+    return regressions
+
+
+def main():
+    repo_root = find_repo_root()
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark generate-dns-config.py against synthetic repositories"
+    )
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000",
+        help="Comma-separated manifest counts (default: 1000,10000)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per measurement; the best time is kept (default: 3)",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=repo_root / ".cache" / "generate-dns-config" / "benchmark-baseline.json",
+        help="Baseline JSON file (default: .cache/generate-dns-config/benchmark-baseline.json)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write these results as the new baseline",
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=1.25,
+        help="Fail if any measurement is slower than baseline by this factor (default: 1.25)",
+    )
+
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    gen = load_generator(repo_root)
+
+    baseline = None
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text()).get("results")
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="dns-config-bench-") as workdir:
+        for size in sizes:
+            results[str(size)] = benchmark_size(gen, size, args.repeat, Path(workdir))
+
+    regressions = print_results(results, baseline, args.max_regression)
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        merged = dict(baseline or {})
+        merged.update(results)
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "yaml_loader": gen.YAML_LOADER.__name__,
+            "recorded": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "results": merged,
+        }, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if baseline is None:
+        print("\nNo baseline found. Record one with --update-baseline.")
+        return
+
+    if regressions:
+        print(f"\n{len(regressions)} measurement(s) regressed beyond {args.max_regression}x:")
+        for name in regressions:
+            print(f"  - {name}")
+        sys.exit(1)
+
+    print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
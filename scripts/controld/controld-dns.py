@@ -14,6 +14,9 @@ Usage:
     # List specific profile
     ./scripts/controld/controld-dns.py list --profile Default
 
+    # Reuse API responses up to 5 minutes old
+    ./scripts/controld/controld-dns.py list --cache-ttl 300
+
     # Sync to all profiles (defined in config.yaml)
     ./scripts/controld/controld-dns.py sync --dry-run
     ./scripts/controld/controld-dns.py sync
@@ -21,6 +24,24 @@ Usage:
     # Sync to specific profiles only
     ./scripts/controld/controld-dns.py sync --profile Default,Infra
 
+    # Apply up to 8 rule changes at once (deletes still finish before adds)
+    ./scripts/controld/controld-dns.py sync --concurrency 8
+
+    # One hostname per create/update request instead of batches of 25
+    ./scripts/controld/controld-dns.py sync --batch-size 1
+
+    # Sync *.home-infra.net-style wildcards plus overrides instead of one rule per host
+    ./scripts/controld/controld-dns.py sync --compact --dry-run
+
+    # Skip the sync entirely if nothing changed locally since the last one
+    ./scripts/controld/controld-dns.py sync --if-changed
+
+    # Fetch every profile's rules even if verified within --drift-interval
+    ./scripts/controld/controld-dns.py sync --verify
+
+    # Retry only what a failed or interrupted sync left outstanding
+    ./scripts/controld/controld-dns.py sync --resume
+
     # Purge all profiles
     ./scripts/controld/controld-dns.py purge --confirm --dry-run
 
@@ -29,15 +50,25 @@ Override with CONTROLD_API_TOKEN env var or --token-file argument.
 """
 
 import argparse
+import calendar
+import hashlib
+import http.client
+import io
 import json
 import os
 import subprocess
 import sys
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Callable
+
+# Shared helpers live next to the per-service script directories
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from sync_common import RateLimiter, SyncJournal, journal_path  # noqa: E402
 
 try:
     import yaml
@@ -46,6 +77,30 @@ except ImportError:
     print("Or enter nix-shell which includes it.")
     sys.exit(1)
 
+# Optional: binary registries from generate-dns-config.py --registry-out
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Generator registry format accepted in place of the YAML file
+REGISTRY_SUFFIXES = (".json", ".msgpack")
+REGISTRY_SCHEMA = "dns-service-registry"
+REGISTRY_SCHEMA_VERSION = 1
+
+USER_AGENT = "controld-dns.py"
+
+# Client-side request pacing; halved on each 429 and recovered on success
+RATE_LIMIT_PER_SECOND = 10.0
+RATE_LIMIT_BURST = 10
+
+# Hostnames per create/update request (rules sharing an IP are batched)
+DEFAULT_BATCH_SIZE = 25
+
+# Seconds a profile synced with unchanged desired state is trusted before
+# its rules are fetched again to catch changes made outside this script
+DEFAULT_DRIFT_INTERVAL = 3600
+
 # Action types
 ACTION_BLOCK = 0
 ACTION_BYPASS = 1
@@ -60,14 +115,204 @@ ACTION_NAMES = {
 }
 
 
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections, reused across requests and threads.
+
+    Idle connections are kept per (scheme, host, port). A request checks one
+    out, and it goes back to the pool once the response has been read in
+    full, so a sync pays the TCP/TLS handshake once instead of per rule.
+    """
+
+    def __init__(self, timeout: float = 30, max_idle: int = 8):
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.lock = threading.Lock()
+        self.idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self.requests = 0
+        self.opened = 0
+        self.reused = 0
+
+    def _acquire(self, key: tuple[str, str, int]) -> tuple[http.client.HTTPConnection, bool]:
+        """Return (connection, whether it was reused) for key."""
+        with self.lock:
+            self.requests += 1
+            idle = self.idle.get(key)
+            if idle:
+                self.reused += 1
+                return idle.pop(), True
+            self.opened += 1
+
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout), False
+        return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+
+    def _release(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self.lock:
+            idle = self.idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(
+        self, method: str, url: str, body: bytes | None, headers: dict
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """Send a request and return (status, headers, body).
+
+        A reused connection the server has meanwhile closed is retried once
+        on a fresh connection; other network errors propagate as OSError or
+        http.client.HTTPException.
+        """
+        parts = urllib.parse.urlsplit(url)
+        default_port = 443 if parts.scheme == "https" else 80
+        key = (parts.scheme, parts.hostname, parts.port or default_port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if reused:
+                    continue
+                raise
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return response.status, response.headers, data
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self.lock:
+            for idle in self.idle.values():
+                for conn in idle:
+                    conn.close()
+            self.idle.clear()
+
+    def stats(self) -> str:
+        """Summarize connection reuse, e.g. for the end of a sync."""
+        return (
+            f"HTTP: {self.requests} request(s) over {self.opened} connection(s), "
+            f"{self.reused} reused"
+        )
+
+
 class ControlDClient:
-    """Client for ControlD API."""
+    """Client for ControlD API.
+
+    GET responses are memoized for the lifetime of the client (one run), so
+    profile and folder lookups hit the API once however many profiles are
+    processed. Any write to a profile drops its cached responses. With
+    cache_path and cache_ttl > 0, responses are also reused from disk
+    across runs (used by list).
+    """
 
-    def __init__(self, api_token: str, base_url: str = "https://api.controld.com"):
+    def __init__(
+        self,
+        api_token: str,
+        base_url: str = "https://api.controld.com",
+        pool_size: int = 8,
+        cache_path: Path | None = None,
+        cache_ttl: float = 0,
+    ):
         self.api_token = api_token
         self.base_url = base_url.rstrip("/")
-        self.max_retries = 3
-        self.retry_delay = 2
+        self.max_retries = 6
+        self.pool = ConnectionPool(max_idle=max(pool_size, 8))
+        self.limiter = RateLimiter(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+
+        self.cache: dict[str, dict] = {}
+        self.cache_lock = threading.Lock()
+        self.fetch_locks: dict[str, threading.Lock] = {}
+        self.cache_hits = 0
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        # Disk entries are scoped to the account and API host
+        self.cache_scope = hashlib.sha256(f"{self.base_url} {api_token}".encode()).hexdigest()[:16]
+        self.disk_cache = self._load_disk_cache()
+        self.disk_dirty = False
+
+    def _load_disk_cache(self) -> dict[str, dict]:
+        if self.cache_path is None:
+            return {}
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get(self.cache_scope, {}) if isinstance(data, dict) else {}
+
+    def _get(self, endpoint: str) -> dict:
+        """GET endpoint, memoized for the run (and on disk within cache_ttl)."""
+        with self.cache_lock:
+            fetch_lock = self.fetch_locks.setdefault(endpoint, threading.Lock())
+
+        # Concurrent callers for the same endpoint wait for a single fetch
+        with fetch_lock:
+            with self.cache_lock:
+                if endpoint in self.cache:
+                    self.cache_hits += 1
+                    return self.cache[endpoint]
+                entry = self.disk_cache.get(endpoint)
+                if entry and self.cache_ttl > 0 and time.time() - entry["fetched_at"] < self.cache_ttl:
+                    self.cache_hits += 1
+                    self.cache[endpoint] = entry["response"]
+                    return entry["response"]
+
+            resp = self._request("GET", endpoint)
+            with self.cache_lock:
+                self.cache[endpoint] = resp
+                if self.cache_path is not None and self.cache_ttl > 0:
+                    self.disk_cache[endpoint] = {"fetched_at": time.time(), "response": resp}
+                    self.disk_dirty = True
+            return resp
+
+    def _invalidate(self, profile_id: str) -> None:
+        """Drop cached responses for a profile after writing to it."""
+        prefix = f"/profiles/{profile_id}/"
+        with self.cache_lock:
+            for cache in (self.cache, self.disk_cache):
+                for endpoint in [key for key in cache if key.startswith(prefix)]:
+                    del cache[endpoint]
+                    if cache is self.disk_cache:
+                        self.disk_dirty = True
+
+    def close(self) -> None:
+        """Close pooled connections and write back the disk cache if it changed."""
+        self.pool.close()
+        if self.cache_path is None or not self.disk_dirty:
+            return
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                data = {}
+        except (OSError, ValueError):
+            data = {}
+        data[self.cache_scope] = self.disk_cache
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data))
+        tmp_path.replace(self.cache_path)
+        self.disk_dirty = False
+
+    def stats(self) -> str:
+        """Summarize API traffic for the end of a run."""
+        return (
+            f"{self.pool.stats()}, {self.cache_hits} lookup(s) served from cache, "
+            f"{self.limiter.throttled} rate-limited"
+        )
 
     def _request(
         self, method: str, endpoint: str, data: dict | None = None
@@ -77,6 +322,7 @@ class ControlDClient:
         headers = {
             "Authorization": f"Bearer {self.api_token}",
             "Accept": "application/json",
+            "User-Agent": USER_AGENT,
         }
 
         body = None
@@ -85,29 +331,29 @@ class ControlDClient:
             body = urllib.parse.urlencode(data, doseq=True).encode()
 
         for attempt in range(self.max_retries):
+            self.limiter.acquire()
             try:
-                req = urllib.request.Request(url, data=body, headers=headers, method=method)
-                with urllib.request.urlopen(req, timeout=30) as response:
-                    return json.loads(response.read().decode())
-            except urllib.error.HTTPError as e:
-                if e.code == 429:  # Rate limited
-                    wait = self.retry_delay * (attempt + 1)
-                    print(f"  Rate limited, waiting {wait}s...")
-                    time.sleep(wait)
-                    continue
-                error_body = e.read().decode() if e.fp else ""
-                raise RuntimeError(f"API error {e.code}: {error_body}") from e
-            except urllib.error.URLError as e:
+                status, response_headers, payload = self.pool.request(method, url, body, headers)
+            except (OSError, http.client.HTTPException) as e:
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                    time.sleep(self.limiter.backoff(attempt))
                     continue
-                raise RuntimeError(f"Network error: {e.reason}") from e
+                raise RuntimeError(f"Network error: {e}") from e
+
+            if status == 429:  # Rate limited
+                wait = self.limiter.on_rate_limited(response_headers, attempt)
+                print(f"  Rate limited, backing off {wait:.1f}s...")
+                continue
+            self.limiter.on_success(response_headers)
+            if status >= 400:
+                raise RuntimeError(f"API error {status}: {payload.decode()}")
+            return json.loads(payload.decode())
 
         raise RuntimeError("Max retries exceeded")
 
     def get_profiles(self) -> list[dict]:
         """Get all profiles."""
-        resp = self._request("GET", "/profiles")
+        resp = self._get("/profiles")
         return resp.get("body", {}).get("profiles", [])
 
     def get_profile_by_name(self, name: str) -> dict | None:
@@ -120,7 +366,7 @@ class ControlDClient:
 
     def get_folders(self, profile_id: str) -> list[dict]:
         """Get all folders (groups) in a profile."""
-        resp = self._request("GET", f"/profiles/{profile_id}/groups")
+        resp = self._get(f"/profiles/{profile_id}/groups")
         return resp.get("body", {}).get("groups", [])
 
     def get_folder_by_name(self, profile_id: str, name: str) -> dict | None:
@@ -136,48 +382,57 @@ class ControlDClient:
         endpoint = f"/profiles/{profile_id}/rules"
         if folder_id:
             endpoint = f"{endpoint}/{folder_id}"
-        resp = self._request("GET", endpoint)
+        resp = self._get(endpoint)
         return resp.get("body", {}).get("rules", [])
 
     def create_rule(
         self,
         profile_id: str,
-        hostname: str,
+        hostname: str | list[str],
         ip: str,
         folder_id: int = 0,
     ) -> dict:
-        """Create a spoof rule."""
+        """Create spoof rules for one or more hostnames pointing at ip."""
         data = {
-            "hostnames[]": [hostname],
+            "hostnames[]": [hostname] if isinstance(hostname, str) else hostname,
             "do": ACTION_SPOOF,
             "via": ip,
             "status": 1,
         }
         if folder_id:
             data["group"] = folder_id
-        return self._request("POST", f"/profiles/{profile_id}/rules", data)
+        try:
+            return self._request("POST", f"/profiles/{profile_id}/rules", data)
+        finally:
+            self._invalidate(profile_id)
 
     def update_rule(
         self,
         profile_id: str,
-        hostname: str,
+        hostname: str | list[str],
         ip: str,
         folder_id: int = 0,
     ) -> dict:
-        """Update an existing rule."""
+        """Update existing rules for one or more hostnames to point at ip."""
         data = {
-            "hostnames[]": [hostname],
+            "hostnames[]": [hostname] if isinstance(hostname, str) else hostname,
             "do": ACTION_SPOOF,
             "via": ip,
             "status": 1,
         }
         if folder_id:
             data["group"] = folder_id
-        return self._request("PUT", f"/profiles/{profile_id}/rules", data)
+        try:
+            return self._request("PUT", f"/profiles/{profile_id}/rules", data)
+        finally:
+            self._invalidate(profile_id)
 
     def delete_rule(self, profile_id: str, hostname: str) -> dict:
         """Delete a rule by hostname."""
-        return self._request("DELETE", f"/profiles/{profile_id}/rules/{hostname}")
+        try:
+            return self._request("DELETE", f"/profiles/{profile_id}/rules/{hostname}")
+        finally:
+            self._invalidate(profile_id)
 
 
 def load_token_from_sops(token_file: Path) -> str | None:
@@ -252,13 +507,113 @@ def load_config(config_path: Path) -> dict:
     }
 
 
+def load_registry(registry_path: Path) -> dict:
+    """Load a registry written by generate-dns-config.py --registry-out."""
+    data = registry_path.read_bytes()
+    if registry_path.suffix == ".msgpack":
+        if msgpack is None:
+            raise RuntimeError("msgpack is required to read .msgpack registries (pip install msgpack)")
+        registry = msgpack.unpackb(data)
+    else:
+        registry = json.loads(data)
+
+    if registry.get("schema") != REGISTRY_SCHEMA:
+        raise ValueError(f"{registry_path} is not a {REGISTRY_SCHEMA} file")
+    if registry.get("schema_version") != REGISTRY_SCHEMA_VERSION:
+        raise ValueError(
+            f"Unsupported registry schema version {registry.get('schema_version')} "
+            f"(expected {REGISTRY_SCHEMA_VERSION})"
+        )
+    return registry
+
+
 def load_domains(domains_path: Path) -> list[dict]:
-    """Load domain definitions from YAML file."""
+    """Load domain definitions from YAML file or generator registry.
+
+    Registries (*.json / *.msgpack from generate-dns-config.py --registry-out)
+    are loaded without going through YAML.
+    """
+    if domains_path.suffix in REGISTRY_SUFFIXES:
+        return load_registry(domains_path)["domains"]
     with open(domains_path) as f:
         data = yaml.safe_load(f)
         return data.get("domains", [])
 
 
+def payload_digest(content: str) -> str:
+    """Return the SHA-256 digest of a generated file's payload.
+
+    Must match payload_digest() in generate-dns-config.py: everything from
+    the first line that is neither blank nor a comment.
+    """
+    lines = content.splitlines()
+    for index, line in enumerate(lines):
+        if line.strip() and not line.startswith("#"):
+            lines = lines[index:]
+            break
+    else:
+        lines = []
+    return "sha256:" + hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+
+def compute_source_digest(domains_path: Path, config_path: Path, options: str = "") -> str:
+    """Digest of the local inputs to a sync: domains payload, config and options.
+
+    options covers flags that change the desired rules (e.g. --compact).
+    """
+    if domains_path.suffix in REGISTRY_SUFFIXES:
+        digest = hashlib.sha256(domains_path.read_bytes())
+    else:
+        digest = hashlib.sha256(payload_digest(domains_path.read_text()).encode())
+    digest.update(config_path.read_bytes())
+    digest.update(options.encode())
+    return "sha256:" + digest.hexdigest()
+
+
+def load_sync_state(state_path: Path) -> dict:
+    """Load per-profile state recorded by previous successful syncs."""
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {"profiles": {}}
+    state.setdefault("profiles", {})
+    return state
+
+
+def save_sync_state(state_path: Path, state: dict) -> None:
+    """Write sync state atomically."""
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True))
+    tmp_path.replace(state_path)
+
+
+def format_timestamp(seconds: float | None = None) -> str:
+    """Format a UNIX time (default: now) the way sync state records it."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+
+def parse_timestamp(value: str | None) -> float | None:
+    """Parse a format_timestamp() string back to UNIX time, None if invalid."""
+    try:
+        return calendar.timegm(time.strptime(value, "%Y-%m-%dT%H:%M:%SZ"))
+    except (TypeError, ValueError):
+        return None
+
+
+def record_applied(last_applied: dict | None, desired_digest: str, target: dict) -> None:
+    """Note in a profile's sync state that ControlD now matches desired_digest.
+
+    target identifies where the rules live (API scope and folder name); a
+    later run only trusts the entry if its target is the same.
+    """
+    if last_applied is not None:
+        last_applied.update(target)
+        last_applied["desired_digest"] = desired_digest
+        last_applied["verified_at"] = format_timestamp()
+
+
 def parse_profile_filter(profile_arg: str | None) -> list[str]:
     """Parse --profile Default,Infra into list of profile names.
 
@@ -321,17 +676,215 @@ def build_desired_state(domains: list[dict], default_suffixes: list[str]) -> dic
     return desired
 
 
-def parse_current_state(rules: list[dict]) -> dict[str, str]:
-    """Parse current rules into hostname -> IP mapping."""
+def resolve_hostname(hostname: str, rules: dict[str, str]) -> str | None:
+    """Return the IP a set of spoof rules gives hostname.
+
+    An exact rule wins; otherwise the most specific '*.parent' wildcard
+    covering hostname applies. Wildcards do not match the parent itself.
+    """
+    if hostname in rules:
+        return rules[hostname]
+    labels = hostname.split(".")
+    for index in range(1, len(labels)):
+        wildcard = "*." + ".".join(labels[index:])
+        if wildcard in rules:
+            return rules[wildcard]
+    return None
+
+
+def configured_suffixes(domains: list[dict], default_suffixes: list[str]) -> set[str]:
+    """Return every domain suffix the config and domain definitions use."""
+    suffixes = set(default_suffixes)
+    for domain in domains:
+        if "fqdn" not in domain:
+            suffixes.update(domain.get("suffixes", []))
+    return suffixes
+
+
+def compact_desired_state(
+    desired: dict[str, str], suffixes: set[str]
+) -> tuple[dict[str, str], list[str]]:
+    """Replace rules sharing a parent domain and IP with one wildcard.
+
+    For each parent domain (e.g. home-infra.net), the IP most of its direct
+    hostnames point at becomes '*.parent'; only hostnames with a different
+    IP keep explicit rules. A parent is compacted only if that saves rules,
+    and the result is checked to resolve every original hostname the same.
+
+    Since a wildcard also answers for names not in desired, only parents
+    that are one of the configured suffixes (or below one) and have at
+    least two labels are considered, so a TLD such as 'net' never gets one.
+
+    Returns:
+        Tuple of (compacted rules, hostnames that would resolve differently)
+    """
+    by_parent: dict[str, dict[str, list[str]]] = {}
+    for hostname, ip in desired.items():
+        if hostname.startswith("*.") or "." not in hostname:
+            continue
+        parent = hostname.split(".", 1)[1]
+        if "." not in parent or not any(
+            parent == suffix or parent.endswith("." + suffix) for suffix in suffixes
+        ):
+            continue
+        by_parent.setdefault(parent, {}).setdefault(ip, []).append(hostname)
+
+    compacted = dict(desired)
+    for parent, by_ip in by_parent.items():
+        wildcard = f"*.{parent}"
+        ip, hostnames = max(by_ip.items(), key=lambda item: (len(item[1]), item[0]))
+        if len(hostnames) < 2 or compacted.get(wildcard, ip) != ip:
+            continue
+        compacted[wildcard] = ip
+        for hostname in hostnames:
+            del compacted[hostname]
+
+    mismatched = [
+        hostname for hostname in sorted(desired)
+        if resolve_hostname(hostname, compacted) != desired[hostname]
+    ]
+    return compacted, mismatched
+
+
+def parse_current_state(rules: list[dict], include_inactive: bool = False) -> dict[str, str]:
+    """Parse current rules into hostname -> IP mapping.
+
+    Only enabled spoof rules are included, unless include_inactive is set:
+    then every other rule maps to a description such as "inactive: do=0 status=1",
+    which never equals a desired IP.
+    """
     current = {}
     for rule in rules:
         hostname = rule.get("PK", "")
         action = rule.get("action", {})
         if action.get("do") == ACTION_SPOOF and action.get("status") == 1:
             current[hostname] = action.get("via", "")
+        elif include_inactive:
+            current[hostname] = f"inactive: do={action.get('do')} status={action.get('status')}"
     return current
 
 
+class ThreadLocalOutput:
+    """sys.stdout stand-in that diverts a thread's prints into its own buffer.
+
+    Threads that have not called capture() write straight to the real stream,
+    unless they run a callable wrapped by inherit_output() in a capturing
+    thread.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer if buffer is not None else self.stream).write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def capture(self, func: Callable[[], int]) -> tuple[int, str]:
+        """Call func, returning (its result, everything it printed)."""
+        self.local.buffer = io.StringIO()
+        try:
+            return func(), self.local.buffer.getvalue()
+        finally:
+            self.local.buffer = None
+
+    def inherit(self, func: Callable[[], object]) -> Callable[[], object]:
+        """Wrap func so any thread running it prints into the caller's buffer."""
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is None:
+            return func
+
+        def run():
+            self.local.buffer = buffer
+            try:
+                return func()
+            finally:
+                self.local.buffer = None
+        return run
+
+
+def inherit_output(func: Callable[[], object]) -> Callable[[], object]:
+    """Wrap func for a worker thread so its prints stay in the caller's output block.
+
+    Retry and rate-limit messages from nested pools would otherwise bypass
+    the profile's buffer; see ThreadLocalOutput.
+    """
+    if isinstance(sys.stdout, ThreadLocalOutput):
+        return sys.stdout.inherit(func)
+    return func
+
+
+def run_profiles(
+    profiles: list[dict],
+    run_one: Callable[[dict], int],
+    multi_profile_mode: bool,
+    jobs: int = 0,
+) -> list[tuple[str, bool]]:
+    """Run run_one(profile_config) for each profile, in parallel if there are several.
+
+    Each profile's output is buffered and printed as one block, in config
+    order, as soon as it and every profile before it have finished. An
+    exception fails only the profile that raised it.
+
+    Args:
+        profiles: Profile configs to process
+        run_one: Per-profile worker returning 0 on success
+        multi_profile_mode: If True, separate blocks with blank lines
+        jobs: Maximum profiles in flight (0 = all at once, 1 = serial)
+
+    Returns:
+        List of (profile name, success) in config order
+    """
+    def guarded(profile_config: dict) -> int:
+        try:
+            return run_one(profile_config)
+        except Exception as e:
+            prefix = f"[{profile_config['name']}] " if multi_profile_mode else ""
+            print(f"{prefix}Error: {e}")
+            return 1
+
+    results = []
+    if len(profiles) <= 1 or jobs == 1:
+        for profile_config in profiles:
+            if multi_profile_mode and results:
+                print()  # Blank line between profiles
+            results.append((profile_config["name"], guarded(profile_config) == 0))
+        return results
+
+    output = ThreadLocalOutput(sys.stdout)
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=jobs or len(profiles)) as pool:
+            futures = [
+                pool.submit(output.capture, partial(guarded, profile_config))
+                for profile_config in profiles
+            ]
+            for profile_config, future in zip(profiles, futures):
+                result, text = future.result()
+                if multi_profile_mode and results:
+                    print()  # Blank line between profiles
+                print(text, end="")
+                output.flush()
+                results.append((profile_config["name"], result == 0))
+    finally:
+        sys.stdout = output.stream
+    return results
+
+
+def print_profile_summary(results: list[tuple[str, bool]]) -> None:
+    """Print the success/failure summary for a multi-profile run."""
+    print("\n" + "=" * 60)
+    successes = sum(1 for _, success in results if success)
+    failures = len(results) - successes
+    print(f"Summary: {successes}/{len(results)} profiles succeeded")
+    if failures > 0:
+        failed_names = [name for name, success in results if not success]
+        print(f"Failed profiles: {', '.join(failed_names)}")
+
+
 def list_single_profile(
     client: ControlDClient,
     profile_name: str,
@@ -399,13 +952,16 @@ def list_single_profile(
     return 0
 
 
-def cmd_list(client: ControlDClient, config: dict, profile_filter: list[str]) -> int:
+def cmd_list(
+    client: ControlDClient, config: dict, profile_filter: list[str], profile_jobs: int = 0
+) -> int:
     """List current rules in ControlD for one or more profiles.
 
     Args:
         client: ControlD API client
         config: Normalized config with 'profiles' list
         profile_filter: List of profile names to list (empty = all)
+        profile_jobs: Profiles processed at once, see run_profiles()
 
     Returns:
         0 if all profiles succeeded, 1 if any failed
@@ -413,98 +969,350 @@ def cmd_list(client: ControlDClient, config: dict, profile_filter: list[str]) ->
     profiles = filter_profiles(config["profiles"], profile_filter)
     multi_profile_mode = len(config["profiles"]) > 1
 
-    results = []
-    for profile_config in profiles:
-        if multi_profile_mode and len(results) > 0:
-            print()  # Blank line between profiles
-
-        result = list_single_profile(
+    results = run_profiles(
+        profiles,
+        lambda profile_config: list_single_profile(
             client,
             profile_config["name"],
             profile_config["folder_name"],
             multi_profile_mode
-        )
-        results.append((profile_config["name"], result == 0))
+        ),
+        multi_profile_mode,
+        profile_jobs,
+    )
 
     # Print summary if multi-profile and multiple profiles processed
     if multi_profile_mode and len(profiles) > 1:
-        print("\n" + "=" * 60)
-        successes = sum(1 for _, success in results if success)
-        failures = len(results) - successes
-        print(f"Summary: {successes}/{len(results)} profiles succeeded")
-        if failures > 0:
-            failed_names = [name for name, success in results if not success]
-            print(f"Failed profiles: {', '.join(failed_names)}")
+        print_profile_summary(results)
 
     return 0 if all(success for _, success in results) else 1
 
 
+def compute_plan(desired: dict[str, str], current: dict[str, str], force: bool) -> dict[str, set]:
+    """Work out which hostnames to add, update and delete.
+
+    With force, every hostname on both sides is rewritten in place (PUT
+    replaces the whole rule), so only the true differences are created or
+    deleted and no name stops resolving while the sync runs.
+
+    Returns:
+        Dict with 'add', 'update' and 'delete' hostname sets
+    """
+    if force:
+        return {
+            "add": set(desired) - set(current),
+            "delete": set(current) - set(desired),
+            "update": set(desired) & set(current),
+        }
+    return {
+        "add": set(desired) - set(current),
+        "delete": set(current) - set(desired),
+        "update": {k for k in set(desired) & set(current) if desired[k] != current[k]},
+    }
+
+
+def rules_fingerprint(current: dict[str, str]) -> str:
+    """Digest of a rule set (hostname -> IP), order-independent."""
+    encoded = json.dumps(sorted(current.items()), separators=(",", ":")).encode()
+    return "sha256:" + hashlib.sha256(encoded).hexdigest()
+
+
+class PlanCache:
+    """Sync plans for one desired state, keyed by remote rule fingerprint.
+
+    Profiles whose current rules are identical get the same plan without
+    recomputing it. Safe to share between profile worker threads.
+    """
+
+    def __init__(self, desired: dict[str, str], force: bool):
+        self.desired = desired
+        self.force = force
+        self.plans: dict[str, dict[str, set]] = {}
+        self.lock = threading.Lock()
+
+    def get(self, current: dict[str, str]) -> tuple[dict[str, set], str, bool]:
+        """Return (plan, fingerprint, whether it was reused) for a current state."""
+        fingerprint = rules_fingerprint(current)
+        with self.lock:
+            plan = self.plans.get(fingerprint)
+            if plan is not None:
+                return plan, fingerprint, True
+            plan = compute_plan(self.desired, current, self.force)
+            self.plans[fingerprint] = plan
+            return plan, fingerprint, False
+
+
+def apply_mutations(
+    operations: list[tuple[str, Callable[[], object]]], prefix: str, concurrency: int = 1
+) -> int:
+    """Run API mutations and print one OK/FAILED line per operation.
+
+    With concurrency > 1 the calls run on a bounded thread pool, but results
+    are still printed in the order given, so output is deterministic. A call
+    may return a per-host report from batch_mutation(); only the hostnames
+    that failed there are listed and counted.
+
+    Args:
+        operations: List of (label, call) pairs, e.g. ("Deleting x", ...)
+        prefix: Output prefix ([ProfileName] in multi-profile mode)
+        concurrency: Maximum number of requests in flight
+
+    Returns:
+        Number of failed hostnames
+    """
+    def report(result) -> tuple[str, list[str]]:
+        # Plain API responses are dicts; only batch_mutation() returns a list
+        if not isinstance(result, list) or not result:
+            return "OK", []
+        failures = [f"{prefix}    {hostname}: FAILED: {error}" for hostname, error in result if error]
+        return (
+            f"batch failed, retried per host: {len(result) - len(failures)} OK, "
+            f"{len(failures)} failed"
+        ), failures
+
+    errors = 0
+    if concurrency <= 1 or len(operations) <= 1:
+        for label, call in operations:
+            try:
+                print(f"{prefix}  {label}...", end=" ")
+                status, failures = report(call())
+            except Exception as e:
+                print(f"FAILED: {e}")
+                errors += 1
+                continue
+            print(status)
+            for line in failures:
+                print(line)
+            errors += len(failures)
+        return errors
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(inherit_output(call)) for _, call in operations]
+        for (label, _), future in zip(operations, futures):
+            try:
+                status, failures = report(future.result())
+            except Exception as e:
+                print(f"{prefix}  {label}... FAILED: {e}")
+                errors += 1
+                continue
+            print(f"{prefix}  {label}... {status}")
+            for line in failures:
+                print(line)
+            errors += len(failures)
+    return errors
+
+
+def batch_mutation(
+    method: Callable, profile_id: str, hostnames: list[str], ip: str, folder_id: int
+) -> list[tuple[str, Exception | None]]:
+    """Apply create_rule/update_rule to several hostnames in one request.
+
+    If the batch request fails, each hostname is retried on its own so one
+    bad entry does not fail the rest.
+
+    Returns:
+        Empty list if the batch succeeded, otherwise (hostname, error or None)
+        for every hostname in the batch
+    """
+    try:
+        method(profile_id, hostnames, ip, folder_id)
+        return []
+    except Exception:
+        if len(hostnames) == 1:
+            raise
+
+    results = []
+    for hostname in hostnames:
+        try:
+            method(profile_id, hostname, ip, folder_id)
+            results.append((hostname, None))
+        except Exception as e:
+            results.append((hostname, e))
+    return results
+
+
+def journaled(
+    journal: SyncJournal | None, action: str, hostnames: list[str], call: Callable[[], object]
+) -> Callable[[], object]:
+    """Wrap an apply_mutations() call so its outcome per hostname goes to journal."""
+    if journal is None:
+        return call
+
+    def run():
+        try:
+            result = call()
+        except Exception as e:
+            journal.failed(action, hostnames, e)
+            raise
+        # As in apply_mutations(), only batch_mutation() reports are lists
+        failed = {}
+        if isinstance(result, list):
+            failed = {hostname: error for hostname, error in result if error}
+        done = [hostname for hostname in hostnames if hostname not in failed]
+        if done:
+            journal.done(action, done)
+        for hostname, error in failed.items():
+            journal.failed(action, [hostname], error)
+        return result
+
+    return run
+
+
+def batched_operations(
+    verb: str,
+    method: Callable,
+    profile_id: str,
+    hostnames: set[str],
+    desired: dict[str, str],
+    folder_id: int,
+    batch_size: int,
+    journal: SyncJournal | None = None,
+    action: str = "",
+) -> list[tuple[str, Callable[[], object]]]:
+    """Group hostnames by target IP into apply_mutations() operations of batch_size.
+
+    If journal is given, each batch's outcome is recorded under action.
+    """
+    by_ip: dict[str, list[str]] = {}
+    for hostname in sorted(hostnames):
+        by_ip.setdefault(desired[hostname], []).append(hostname)
+
+    operations = []
+    for ip, ip_hostnames in sorted(by_ip.items()):
+        for start in range(0, len(ip_hostnames), batch_size):
+            batch = ip_hostnames[start:start + batch_size]
+            if len(batch) == 1:
+                label = f"{verb} {batch[0]} -> {ip}"
+            else:
+                label = f"{verb} {len(batch)} rules -> {ip} ({batch[0]} .. {batch[-1]})"
+            call = partial(batch_mutation, method, profile_id, batch, ip, folder_id)
+            operations.append((label, journaled(journal, action, batch, call)))
+    return operations
+
+
 def sync_single_profile(
     client: ControlDClient,
     profile_name: str,
     folder_name: str,
-    suffixes: list[str],
-    domains: list[dict],
+    desired: dict[str, str],
     dry_run: bool,
     force: bool,
-    multi_profile_mode: bool = False
+    multi_profile_mode: bool = False,
+    concurrency: int = 1,
+    batch_size: int = 1,
+    plans: PlanCache | None = None,
+    last_applied: dict | None = None,
+    drift_interval: float = 0,
+    journal: SyncJournal | None = None,
+    resume: bool = False,
 ) -> int:
-    """Sync domains to a single profile.
+    """Sync desired rules to a single profile.
+
+    A profile whose last_applied entry shows the same desired state, API
+    scope and folder, verified against ControlD less than drift_interval
+    seconds ago, is skipped without fetching its rules.
 
     Args:
         client: ControlD API client
         profile_name: Profile name to sync
         folder_name: Folder name within profile
-        suffixes: Default domain suffixes
-        domains: Domain definitions
+        desired: Desired hostname -> IP rules, see build_desired_state()
         dry_run: If True, preview without applying
-        force: If True, recreate all rules
+        force: If True, rewrite every rule and verify the result
         multi_profile_mode: If True, prefix output with [ProfileName]
+        concurrency: Maximum rule changes in flight within each phase
+        batch_size: Maximum hostnames per create/update request
+        plans: Plans shared with other profiles syncing the same desired state
+        last_applied: Sync state entry for this profile; desired_digest,
+            verified_at, api_scope and folder_name are updated after a
+            successful sync
+        drift_interval: Seconds a verified profile is trusted (0 = always fetch)
+        journal: Journal to record planned and completed changes in
+        resume: If True, replay the journal's outstanding changes instead of
+            fetching and diffing the profile's rules
 
     Returns:
         0 on success, 1 on error
     """
     prefix = f"[{profile_name}] " if multi_profile_mode else ""
 
-    print(f"{prefix}Looking up profile '{profile_name}'...")
-    profile = client.get_profile_by_name(profile_name)
-    if not profile:
-        print(f"{prefix}Error: Profile '{profile_name}' not found")
-        return 1
-
-    profile_id = profile["PK"]
-    print(f"{prefix}Profile: {profile_name} (PK: {profile_id})")
-
-    print(f"{prefix}Looking up folder '{folder_name}'...")
-    folder = client.get_folder_by_name(profile_id, folder_name)
-    if not folder:
-        print(f"{prefix}Error: Folder '{folder_name}' not found")
-        return 1
-
-    folder_id = folder["PK"]
-    print(f"{prefix}Folder: {folder_name} (PK: {folder_id})")
-
-    # Build desired state
-    desired = build_desired_state(domains, suffixes)
-    print(f"\n{prefix}Desired state: {len(desired)} rules")
-
-    # Get current state
-    print(f"{prefix}Fetching current rules...")
-    rules = client.get_rules(profile_id, folder_id)
-    current = parse_current_state(rules)
-    print(f"{prefix}Current state: {len(current)} rules")
-
-    # Calculate changes
-    if force:
-        to_delete = set(current.keys())
-        to_add = set(desired.keys())
-        to_update = set()
+    desired_digest = rules_fingerprint(desired)
+    # API host/account and folder the recorded state applies to
+    target = {"api_scope": client.cache_scope, "folder_name": folder_name}
+    current: dict[str, str] = {}
+    if resume:
+        pending = journal.outstanding() if journal is not None else None
+        if pending is None:
+            print(f"{prefix}No interrupted sync to resume")
+            return 0
+        if pending["digest"] != desired_digest:
+            print(
+                f"{prefix}Error: desired rules changed since the interrupted sync "
+                f"({pending['at']}) - run a normal sync instead"
+            )
+            return 1
+        profile_id, folder_id, ops = pending["profile_id"], pending["folder_id"], pending["ops"]
+        print(f"{prefix}Resuming sync planned at {pending['at']} (profile PK: {profile_id})")
     else:
-        to_add = set(desired.keys()) - set(current.keys())
-        to_delete = set(current.keys()) - set(desired.keys())
-        to_update = {
-            k for k in set(desired.keys()) & set(current.keys()) if desired[k] != current[k]
+        if (
+            last_applied is not None
+            and drift_interval > 0
+            and not force
+            and not dry_run
+            and last_applied.get("desired_digest") == desired_digest
+            and all(last_applied.get(key) == value for key, value in target.items())
+        ):
+            verified_at = parse_timestamp(last_applied.get("verified_at"))
+            age = time.time() - verified_at if verified_at is not None else None
+            if age is not None and 0 <= age < drift_interval:
+                print(
+                    f"{prefix}Desired state unchanged ({desired_digest[:19]}), remote verified "
+                    f"{age / 60:.0f} min ago - skipping rule fetch (use --verify to check now)"
+                )
+                # Verified since any journaled plan, so nothing is left to resume
+                if journal is not None:
+                    journal.clear()
+                return 0
+
+        print(f"{prefix}Looking up profile '{profile_name}'...")
+        profile = client.get_profile_by_name(profile_name)
+        if not profile:
+            print(f"{prefix}Error: Profile '{profile_name}' not found")
+            return 1
+
+        profile_id = profile["PK"]
+        print(f"{prefix}Profile: {profile_name} (PK: {profile_id})")
+
+        print(f"{prefix}Looking up folder '{folder_name}'...")
+        folder = client.get_folder_by_name(profile_id, folder_name)
+        if not folder:
+            print(f"{prefix}Error: Folder '{folder_name}' not found")
+            return 1
+
+        folder_id = folder["PK"]
+        print(f"{prefix}Folder: {folder_name} (PK: {folder_id})")
+
+        print(f"\n{prefix}Desired state: {len(desired)} rules")
+
+        # Get current state
+        print(f"{prefix}Fetching current rules...")
+        rules = client.get_rules(profile_id, folder_id)
+        # Force also rewrites (or deletes) disabled and non-spoof rules in the folder
+        current = parse_current_state(rules, include_inactive=force)
+        print(f"{prefix}Current state: {len(current)} rules")
+
+        # Calculate changes, reusing the plan of a profile with identical rules
+        if plans is None:
+            plans = PlanCache(desired, force)
+        plan, fingerprint, reused = plans.get(current)
+        if reused:
+            print(f"{prefix}Remote rules match another profile ({fingerprint[:19]}), reusing its plan")
+        ops = {
+            "delete": {hostname: current[hostname] for hostname in sorted(plan["delete"])},
+            "add": {hostname: desired[hostname] for hostname in sorted(plan["add"])},
+            "update": {hostname: desired[hostname] for hostname in sorted(plan["update"])},
         }
+    to_add, to_update, to_delete = ops["add"], ops["update"], ops["delete"]
 
     # Report changes
     print(f"\n{prefix}{'Sync preview (dry-run)' if dry_run else 'Sync changes'}:")
@@ -512,13 +1320,18 @@ def sync_single_profile(
 
     if not to_add and not to_update and not to_delete:
         print(f"{prefix}No changes needed - already in sync!")
+        # Nothing left to resume once remote matches desired
+        if journal is not None and not dry_run:
+            journal.clear()
+        record_applied(last_applied, desired_digest, target)
         return 0
 
     for hostname in sorted(to_add):
-        print(f"{prefix}  [ADD]    {hostname:<40} -> {desired[hostname]}")
+        print(f"{prefix}  [ADD]    {hostname:<40} -> {to_add[hostname]}")
 
     for hostname in sorted(to_update):
-        print(f"{prefix}  [UPDATE] {hostname:<40} -> {desired[hostname]} (was {current[hostname]})")
+        was = f" (was {current[hostname]})" if hostname in current else ""
+        print(f"{prefix}  [UPDATE] {hostname:<40} -> {to_update[hostname]}{was}")
 
     for hostname in sorted(to_delete):
         print(f"{prefix}  [DELETE] {hostname}")
@@ -529,45 +1342,61 @@ def sync_single_profile(
         print(f"\n{prefix}Dry-run mode - no changes applied.")
         return 0
 
-    # Apply changes
+    # Remote no longer matches a verified state until this sync completes
+    if last_applied is not None:
+        last_applied.pop("verified_at", None)
+    if journal is not None and not resume:
+        journal.plan(desired_digest, ops, profile_id=profile_id, folder_id=folder_id)
+
+    # Apply changes; each phase finishes before the next starts
     print(f"\n{prefix}Applying changes...")
     errors = 0
 
     # Delete first
-    for hostname in sorted(to_delete):
-        try:
-            print(f"{prefix}  Deleting {hostname}...", end=" ")
-            client.delete_rule(profile_id, hostname)
-            print("OK")
-        except Exception as e:
-            print(f"FAILED: {e}")
-            errors += 1
-
-    # Then add
-    for hostname in sorted(to_add):
-        try:
-            print(f"{prefix}  Adding {hostname} -> {desired[hostname]}...", end=" ")
-            client.create_rule(profile_id, hostname, desired[hostname], folder_id)
-            print("OK")
-        except Exception as e:
-            print(f"FAILED: {e}")
-            errors += 1
-
-    # Then update
-    for hostname in sorted(to_update):
-        try:
-            print(f"{prefix}  Updating {hostname} -> {desired[hostname]}...", end=" ")
-            client.update_rule(profile_id, hostname, desired[hostname], folder_id)
-            print("OK")
-        except Exception as e:
-            print(f"FAILED: {e}")
-            errors += 1
+    errors += apply_mutations([
+        (
+            f"Deleting {hostname}",
+            journaled(journal, "delete", [hostname], partial(client.delete_rule, profile_id, hostname)),
+        )
+        for hostname in sorted(to_delete)
+    ], prefix, concurrency)
+
+    # Then add and update, batched by target IP
+    errors += apply_mutations(batched_operations(
+        "Adding", client.create_rule, profile_id, set(to_add), to_add, folder_id, batch_size,
+        journal, "add",
+    ), prefix, concurrency)
+    errors += apply_mutations(batched_operations(
+        "Updating", client.update_rule, profile_id, set(to_update), to_update, folder_id, batch_size,
+        journal, "update",
+    ), prefix, concurrency)
 
     if errors:
         print(f"\n{prefix}Completed with {errors} errors")
+        if journal is not None:
+            print(f"{prefix}Outstanding changes are journaled; `sync --resume` retries only those")
         return 1
 
+    if journal is not None:
+        journal.clear()
+
+    if force:
+        print(f"\n{prefix}Verifying remote rules...")
+        remote = parse_current_state(client.get_rules(profile_id, folder_id), include_inactive=True)
+        mismatched = sorted(
+            hostname for hostname in set(remote) | set(desired)
+            if remote.get(hostname) != desired.get(hostname)
+        )
+        if mismatched:
+            print(f"{prefix}Error: remote rules differ from desired state after sync:")
+            for hostname in mismatched:
+                print(f"{prefix}  {hostname}: {remote.get(hostname, 'missing')} "
+                      f"(want {desired.get(hostname, 'absent')})")
+            return 1
+        print(f"{prefix}Remote matches desired state ({len(desired)} rules)")
+
     print(f"\n{prefix}Sync completed successfully!")
+    record_applied(last_applied, desired_digest, target)
     return 0
 
 
@@ -578,6 +1407,15 @@ def cmd_sync(
     dry_run: bool = False,
     force: bool = False,
     profile_filter: list[str] = None,
+    sync_state: dict | None = None,
+    source_digest: str | None = None,
+    concurrency: int = 1,
+    profile_jobs: int = 0,
+    batch_size: int = 1,
+    compact: bool = False,
+    drift_interval: float = 0,
+    journal_dir: Path | None = None,
+    resume: bool = False,
 ) -> int:
     """Sync local config with ControlD for one or more profiles.
 
@@ -586,47 +1424,86 @@ def cmd_sync(
         config: Normalized config with 'profiles' list
         domains: Domain definitions
         dry_run: If True, preview without applying
-        force: If True, recreate all rules
+        force: If True, rewrite every rule and verify the result
         profile_filter: List of profile names to sync (empty = all)
+        sync_state: State dict to record source_digest, desired_digest and
+            verified_at in for each profile that synced successfully (ignored
+            in dry-run mode)
+        source_digest: Digest of the local inputs, see compute_source_digest()
+        concurrency: Maximum rule changes in flight within each phase
+        profile_jobs: Profiles processed at once, see run_profiles()
+        batch_size: Maximum hostnames per create/update request
+        compact: If True, sync wildcard-compacted rules
+        drift_interval: Skip fetching rules of profiles whose desired state is
+            unchanged and was verified within this many seconds (0 = never skip)
+        journal_dir: Directory for per-profile journals, see SyncJournal
+        resume: If True, replay outstanding journaled changes only
 
     Returns:
         0 if all profiles succeeded, 1 if any failed
     """
     profiles = filter_profiles(config["profiles"], profile_filter or [])
-    suffixes = config["suffixes"]
     multi_profile_mode = len(config["profiles"]) > 1
 
+    # Every profile gets the same rules, so build (and compact) them once
+    desired = build_desired_state(domains, config["suffixes"])
+    if compact:
+        compacted, mismatched = compact_desired_state(
+            desired, configured_suffixes(domains, config["suffixes"])
+        )
+        if mismatched:
+            print(f"Error: compaction would change resolution of: {', '.join(mismatched)}")
+            return 1
+        wildcards = sorted(hostname for hostname in compacted if hostname.startswith("*."))
+        print(
+            f"Compacted {len(desired)} rules to {len(compacted)} "
+            f"({', '.join(f'{w} -> {compacted[w]}' for w in wildcards) or 'no wildcards'}), "
+            f"verified for all {len(desired)} hostnames\n"
+        )
+        desired = compacted
+    plans = PlanCache(desired, force)
+
     # Announce profiles being synced
     if multi_profile_mode:
         profile_names = [p["name"] for p in profiles]
         print(f"Syncing to {len(profiles)} profile(s): {', '.join(profile_names)}\n")
 
-    results = []
-    for profile_config in profiles:
-        if multi_profile_mode and len(results) > 0:
-            print()  # Blank line between profiles
+    def last_applied(name: str) -> dict | None:
+        if dry_run or sync_state is None:
+            return None
+        return sync_state["profiles"].setdefault(name, {})
 
-        result = sync_single_profile(
+    results = run_profiles(
+        profiles,
+        lambda profile_config: sync_single_profile(
             client,
             profile_config["name"],
             profile_config["folder_name"],
-            suffixes,
-            domains,
+            desired,
             dry_run,
             force,
-            multi_profile_mode
-        )
-        results.append((profile_config["name"], result == 0))
+            multi_profile_mode,
+            concurrency,
+            batch_size,
+            plans,
+            last_applied(profile_config["name"]),
+            drift_interval,
+            SyncJournal(journal_path(journal_dir, profile_config["name"])) if journal_dir else None,
+            resume,
+        ),
+        multi_profile_mode,
+        profile_jobs,
+    )
+    for name, success in results:
+        if success and not dry_run and sync_state is not None and source_digest:
+            sync_state["profiles"][name].update(
+                source_digest=source_digest,
+                synced_at=format_timestamp(),
+            )
 
     # Print summary if multi-profile and multiple profiles processed
     if multi_profile_mode and len(profiles) > 1:
-        print("\n" + "=" * 60)
-        successes = sum(1 for _, success in results if success)
-        failures = len(results) - successes
-        print(f"Summary: {successes}/{len(results)} profiles succeeded")
-        if failures > 0:
-            failed_names = [name for name, success in results if not success]
-            print(f"Failed profiles: {', '.join(failed_names)}")
+        print_profile_summary(results)
 
     return 0 if all(success for _, success in results) else 1
 
@@ -636,7 +1513,8 @@ def purge_single_profile(
     profile_name: str,
     folder_name: str,
     dry_run: bool,
-    multi_profile_mode: bool = False
+    multi_profile_mode: bool = False,
+    concurrency: int = 1,
 ) -> int:
     """Purge all rules from a single profile folder.
 
@@ -646,6 +1524,7 @@ def purge_single_profile(
         folder_name: Folder name within profile
         dry_run: If True, preview without deleting
         multi_profile_mode: If True, prefix output with [ProfileName]
+        concurrency: Maximum deletions in flight
 
     Returns:
         0 on success, 1 on error
@@ -688,16 +1567,10 @@ def purge_single_profile(
         return 0
 
     print(f"\n{prefix}Deleting {len(hostnames)} rules...")
-    errors = 0
-
-    for hostname in sorted(hostnames):
-        try:
-            print(f"{prefix}  Deleting {hostname}...", end=" ")
-            client.delete_rule(profile_id, hostname)
-            print("OK")
-        except Exception as e:
-            print(f"FAILED: {e}")
-            errors += 1
+    errors = apply_mutations([
+        (f"Deleting {hostname}", partial(client.delete_rule, profile_id, hostname))
+        for hostname in sorted(hostnames)
+    ], prefix, concurrency)
 
     if errors:
         print(f"\n{prefix}Completed with {errors} errors")
@@ -712,6 +1585,8 @@ def cmd_purge(
     config: dict,
     dry_run: bool = False,
     profile_filter: list[str] = None,
+    concurrency: int = 1,
+    profile_jobs: int = 0,
 ) -> int:
     """Delete all rules in folder(s) for one or more profiles.
 
@@ -720,6 +1595,8 @@ def cmd_purge(
         config: Normalized config with 'profiles' list
         dry_run: If True, preview without deleting
         profile_filter: List of profile names to purge (empty = all)
+        concurrency: Maximum deletions in flight per profile
+        profile_jobs: Profiles processed at once, see run_profiles()
 
     Returns:
         0 if all profiles succeeded, 1 if any failed
@@ -732,29 +1609,23 @@ def cmd_purge(
         profile_names = [p["name"] for p in profiles]
         print(f"Purging {len(profiles)} profile(s): {', '.join(profile_names)}\n")
 
-    results = []
-    for profile_config in profiles:
-        if multi_profile_mode and len(results) > 0:
-            print()  # Blank line between profiles
-
-        result = purge_single_profile(
+    results = run_profiles(
+        profiles,
+        lambda profile_config: purge_single_profile(
             client,
             profile_config["name"],
             profile_config["folder_name"],
             dry_run,
-            multi_profile_mode
-        )
-        results.append((profile_config["name"], result == 0))
+            multi_profile_mode,
+            concurrency,
+        ),
+        multi_profile_mode,
+        profile_jobs,
+    )
 
     # Print summary if multi-profile and multiple profiles processed
     if multi_profile_mode and len(profiles) > 1:
-        print("\n" + "=" * 60)
-        successes = sum(1 for _, success in results if success)
-        failures = len(results) - successes
-        print(f"Summary: {successes}/{len(results)} profiles succeeded")
-        if failures > 0:
-            failed_names = [name for name, success in results if not success]
-            print(f"Failed profiles: {', '.join(failed_names)}")
+        print_profile_summary(results)
 
     return 0 if all(success for _, success in results) else 1
 
@@ -786,7 +1657,7 @@ def main():
         "--domains",
         type=Path,
         default=Path(__file__).parent / "domains.yaml",
-        help="Path to domains.yaml",
+        help="Path to domains.yaml, or a registry from generate-dns-config.py --registry-out",
     )
     parser.add_argument(
         "--token-file",
@@ -794,11 +1665,44 @@ def main():
         default=default_token_file,
         help="Path to SOPS-encrypted token file (default: secrets/controld-token.enc.yaml)",
     )
+    parser.add_argument(
+        "--api-cache",
+        type=Path,
+        default=repo_root / ".cache" / "controld-dns" / "api-cache.json",
+        help="On-disk API response cache for list --cache-ttl "
+        "(default: .cache/controld-dns/api-cache.json)",
+    )
+    parser.add_argument(
+        "--profile-jobs",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Process up to N profiles at once (default: 0 = all; 1 = one at a time)",
+    )
+    parser.add_argument(
+        "--state-file",
+        type=Path,
+        default=repo_root / ".cache" / "controld-dns" / "sync-state.json",
+        help="Path to local sync state (default: .cache/controld-dns/sync-state.json)",
+    )
+    parser.add_argument(
+        "--journal-dir",
+        type=Path,
+        default=repo_root / ".cache" / "controld-dns" / "journal",
+        help="Directory for per-profile sync journals (default: .cache/controld-dns/journal)",
+    )
 
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     # list command
     list_parser = subparsers.add_parser("list", help="List current rules in ControlD")
+    list_parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=0,
+        metavar="SECONDS",
+        help="Reuse API responses cached on disk within SECONDS (default: 0 = always fetch)",
+    )
     list_parser.add_argument(
         "--profile",
         type=str,
@@ -815,7 +1719,49 @@ def main():
     sync_parser.add_argument(
         "--force",
         action="store_true",
-        help="Force recreate all rules",
+        help="Rewrite every rule in place (PUT), create/delete only true differences, then verify",
+    )
+    sync_parser.add_argument(
+        "--if-changed",
+        action="store_true",
+        help="Skip profiles whose domains.yaml/config.yaml inputs are unchanged since their last sync",
+    )
+    sync_parser.add_argument(
+        "--drift-interval",
+        type=float,
+        default=DEFAULT_DRIFT_INTERVAL,
+        metavar="SECONDS",
+        help="Skip fetching rules of profiles whose desired state is unchanged and was "
+        f"verified within SECONDS (default: {DEFAULT_DRIFT_INTERVAL:.0f}; 0 = always fetch)",
+    )
+    sync_parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Fetch and compare every profile's rules, ignoring --drift-interval and --if-changed",
+    )
+    sync_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Replay only the changes an interrupted or failed sync left outstanding",
+    )
+    sync_parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Replace rules sharing a domain and IP with a *.domain wildcard plus overrides",
+    )
+    sync_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        metavar="N",
+        help=f"Hostnames per create/update request, grouped by IP (default: {DEFAULT_BATCH_SIZE})",
+    )
+    sync_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run up to N rule changes at once within each phase (default: 1)",
     )
     sync_parser.add_argument(
         "--profile",
@@ -835,6 +1781,13 @@ def main():
         action="store_true",
         help="Required flag to confirm deletion",
     )
+    purge_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run up to N rule changes at once within each phase (default: 1)",
+    )
     purge_parser.add_argument(
         "--profile",
         type=str,
@@ -842,6 +1795,60 @@ def main():
     )
 
     args = parser.parse_args()
+    concurrency = getattr(args, "concurrency", 1)
+    if concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.profile_jobs < 0:
+        parser.error("--profile-jobs must be 0 or more")
+    if getattr(args, "batch_size", 1) < 1:
+        parser.error("--batch-size must be at least 1")
+    if getattr(args, "drift_interval", 0) < 0:
+        parser.error("--drift-interval must be 0 or more")
+    if getattr(args, "resume", False) and (args.force or args.verify):
+        parser.error("--resume cannot be combined with --force or --verify")
+
+    # Load config
+    if not args.config.exists():
+        print(f"Error: Config file not found: {args.config}")
+        sys.exit(1)
+
+    config = load_config(args.config)
+    profile_filter = parse_profile_filter(getattr(args, "profile", None))
+
+    # Skip before any network access (or token decryption) if nothing changed
+    sync_state = None
+    source_digest = None
+    if args.command == "sync":
+        if not args.domains.exists():
+            print(f"Error: Domains file not found: {args.domains}")
+            sys.exit(1)
+        sync_state = load_sync_state(args.state_file)
+        source_digest = compute_source_digest(
+            args.domains, args.config, "compact" if args.compact else ""
+        )
+        if args.resume:
+            profiles = filter_profiles(config["profiles"], profile_filter)
+            pending = [
+                p["name"] for p in profiles
+                if SyncJournal(journal_path(args.journal_dir, p["name"])).outstanding()
+            ]
+            if not pending:
+                print("No interrupted sync to resume")
+                sys.exit(0)
+            print(f"Resuming interrupted sync for: {', '.join(pending)}")
+            profile_filter = pending
+        elif args.if_changed and not args.force and not args.verify:
+            profiles = filter_profiles(config["profiles"], profile_filter)
+            unchanged = [
+                p["name"] for p in profiles
+                if sync_state["profiles"].get(p["name"], {}).get("source_digest") == source_digest
+            ]
+            if profiles and len(unchanged) == len(profiles):
+                print(f"Local inputs unchanged since last sync ({source_digest[:19]}) - skipping")
+                sys.exit(0)
+            if unchanged:
+                print(f"Unchanged since last sync, skipping: {', '.join(unchanged)}")
+                profile_filter = [p["name"] for p in profiles if p["name"] not in unchanged]
 
     # Get API token (env var takes precedence, then SOPS file)
     api_token = os.environ.get("CONTROLD_API_TOKEN")
@@ -858,32 +1865,45 @@ def main():
         print("  3. Use --token-file to specify a different file")
         sys.exit(1)
 
-    # Load config
-    if not args.config.exists():
-        print(f"Error: Config file not found: {args.config}")
-        sys.exit(1)
-
-    config = load_config(args.config)
-    client = ControlDClient(api_token, config.get("api_base_url", "https://api.controld.com"))
+    client = ControlDClient(
+        api_token,
+        config.get("api_base_url", "https://api.controld.com"),
+        pool_size=concurrency * max(args.profile_jobs or len(config["profiles"]), 1),
+        cache_path=args.api_cache,
+        cache_ttl=getattr(args, "cache_ttl", 0),
+    )
 
     # Execute command
     if args.command == "list":
-        profile_filter = parse_profile_filter(getattr(args, "profile", None))
-        sys.exit(cmd_list(client, config, profile_filter))
+        result = cmd_list(client, config, profile_filter, args.profile_jobs)
     elif args.command == "sync":
-        if not args.domains.exists():
-            print(f"Error: Domains file not found: {args.domains}")
-            sys.exit(1)
         domains = load_domains(args.domains)
-        profile_filter = parse_profile_filter(getattr(args, "profile", None))
-        sys.exit(cmd_sync(client, config, domains, args.dry_run, args.force, profile_filter))
+        result = cmd_sync(
+            client, config, domains, args.dry_run, args.force, profile_filter,
+            sync_state, source_digest, concurrency, args.profile_jobs, args.batch_size,
+            args.compact, 0 if args.verify else args.drift_interval, args.journal_dir,
+            args.resume,
+        )
+        if not args.dry_run:
+            save_sync_state(args.state_file, sync_state)
     elif args.command == "purge":
         if not args.dry_run and not args.confirm:
             print("Error: Purge requires --confirm flag (or use --dry-run to preview)")
             print("Usage: ./controld-dns.py purge --confirm")
             sys.exit(1)
-        profile_filter = parse_profile_filter(getattr(args, "profile", None))
-        sys.exit(cmd_purge(client, config, args.dry_run, profile_filter))
+        if not args.dry_run:
+            # Remote state no longer matches the last sync
+            sync_state = load_sync_state(args.state_file)
+            for profile_config in filter_profiles(config["profiles"], profile_filter):
+                sync_state["profiles"].pop(profile_config["name"], None)
+            save_sync_state(args.state_file, sync_state)
+        result = cmd_purge(
+            client, config, args.dry_run, profile_filter, concurrency, args.profile_jobs
+        )
+
+    client.close()
+    print(f"\n{client.stats()}")
+    sys.exit(result)
 
 
 if __name__ == "__main__":
@@ -3,22 +3,59 @@
 DNS Configuration Generator
 
 Generates configuration files for ControlD DNS and Pangolin VPN by scanning
-HTTPRoute manifests. All services route through Gateway API (INGRESS_IP).
+Gateway API manifests (HTTPRoute, GRPCRoute, TLSRoute and their Gateways).
+Each hostname resolves to the address of the Gateway its route attaches to.
 
 Usage:
     ./scripts/generate-dns-config.py --dry-run    # Preview changes
     ./scripts/generate-dns-config.py              # Generate both configs
-    ./scripts/generate-dns-config.py --diff       # Show diff from current
+    ./scripts/generate-dns-config.py --diff       # Show added/removed/changed hostnames
+    ./scripts/generate-dns-config.py --diff --format json
+    ./scripts/generate-dns-config.py --diff --diff-mode text  # Unified text diff
+    ./scripts/generate-dns-config.py --check [FILE...]  # Fail if outputs are stale
+    ./scripts/generate-dns-config.py --no-cache   # Re-parse every manifest
+    ./scripts/generate-dns-config.py --discovery walk  # Don't use git ls-files
+    ./scripts/generate-dns-config.py --jobs 0     # Parse in one process per CPU
+    ./scripts/generate-dns-config.py --watch      # Regenerate on manifest changes
+    ./scripts/generate-dns-config.py --registry-out .cache/registry.json
+    ./scripts/generate-dns-config.py --timings    # Per-phase wall time / peak RSS
+    ./scripts/generate-dns-config.py --profile    # Dump cProfile stats
+
+Manifests are listed from the git index (tracked + untracked, not ignored),
+falling back to a directory walk that skips docs/, packer/, terraform/, etc.
+Parsed route data is cached per file in .cache/generate-dns-config/ and
+keyed by path, mtime, size and content hash, so unchanged manifests are not
+re-parsed on subsequent runs. Within a multi-document file, documents whose
+top-level kind is not a route or Gateway are skipped before YAML loading, and the
+libyaml CSafeLoader is used when available.
 
 Architecture: All web services use ClusterIP and are accessed via Cilium Gateway API.
 Only the Gateway itself (10.10.2.20) needs a LoadBalancer IP for HTTPS termination.
 """
 
 import argparse
+import contextlib
+import cProfile
+import ctypes
+import ctypes.util
 import difflib
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import pstats
+import re
+import select
+import struct
+import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO
 
 try:
     import yaml
@@ -27,11 +64,30 @@ except ImportError:
     print("Or enter nix-shell which includes it.")
     sys.exit(1)
 
+# Optional: binary registry output (--registry-out *.msgpack)
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Unix only; used for peak RSS in --timings
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Use the libyaml-backed loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 # Gateway API LoadBalancer IP
-# All web services route through this IP for HTTPS termination
+# Fallback for routes whose parent Gateway has no discoverable address
 INGRESS_IP = "10.10.2.20"
 
+# Route kinds whose hostnames are published, plus Gateway for address lookup
+ROUTE_KINDS = {"HTTPRoute", "GRPCRoute", "TLSRoute"}
+INDEXED_KINDS = ROUTE_KINDS | {"Gateway"}
+
 # Domain suffixes managed by Gateway API
 MANAGED_SUFFIXES = {"home-infra.net", "reynoza.org"}
 
@@ -51,6 +107,50 @@ STATIC_RESOURCES = {
     },
 }
 
+# Manifest discovery
+# Filename patterns for route and Gateway manifests, directory names skipped at
+# any depth, and top-level directories that never contain them (the walk
+# backend does not descend into either)
+MANIFEST_PATTERNS = (
+    "*httproute*.yaml",
+    "*grpcroute*.yaml",
+    "*tlsroute*.yaml",
+    "*gateway*.yaml",
+)
+DISCOVERY_EXCLUDE_DIRS = {
+    ".cache",
+    ".git",
+    ".terraform",
+    "node_modules",
+}
+DISCOVERY_EXCLUDE_ROOTS = {
+    "docs",
+    "packer",
+    "terraform",
+}
+
+# Document pre-filter: top-level 'kind:' line, bare document markers (LF or
+# CRLF), constructs (directives, content on a marker line) that make
+# splitting unsafe, and any marker a split left behind
+KIND_RE = re.compile(rb"^kind:[ \t]*[\"']?([A-Za-z0-9]+)", re.MULTILINE)
+DOC_SEPARATOR_RE = re.compile(rb"^(?:---|\.\.\.)[ \t]*(?:#[^\r\n]*)?\r?$", re.MULTILINE)
+UNSAFE_SPLIT_RE = re.compile(rb"^(?:%|(?:---|\.\.\.)[ \t]+[^#\s])", re.MULTILINE)
+DOC_MARKER_RE = re.compile(rb"^(?:---|\.\.\.)", re.MULTILINE)
+
+# Persistent scan cache (relative to repo root)
+# Bump SCAN_CACHE_VERSION whenever the per-file extraction logic changes
+SCAN_CACHE_PATH = ".cache/generate-dns-config/scan-cache.json"
+PROFILE_PATH = ".cache/generate-dns-config/profile.pstats"
+SCAN_CACHE_VERSION = 3
+
+# Machine-readable registry (--registry-out); bump the version on
+# incompatible changes so the sync scripts can refuse unknown layouts
+REGISTRY_SCHEMA = "dns-service-registry"
+REGISTRY_SCHEMA_VERSION = 1
+
+# Seconds of quiet after the last change before --watch regenerates
+WATCH_DEBOUNCE = 0.3
+
 # Category ordering for output
 CATEGORY_ORDER = [
     "infrastructure",
@@ -59,6 +159,85 @@ CATEGORY_ORDER = [
     "arr-stack",
 ]
 
+# Header comments for the generated files (Generated/Digest lines are
+# stamped in after the first three)
+CONTROLD_PREAMBLE = [
+    "# ControlD DNS Domain Definitions",
+    "# Auto-generated by generate-dns-config.py",
+    "# Source: HTTPRoute, GRPCRoute, TLSRoute and Gateway manifests in kubernetes/",
+    "#",
+    "# DO NOT EDIT MANUALLY - changes will be overwritten",
+    "# To customize: edit the route manifests or the generator script",
+    "#",
+    "# Routing architecture:",
+    "#   Route hostnames -> address of the Gateway in the route's parentRefs",
+    f"#     (Cilium Gateway API, HTTPS; {INGRESS_IP} if the Gateway has no address)",
+    "#   Static resources (proxmox, nas) -> direct IPs",
+    "",
+]
+PANGOLIN_PREAMBLE = [
+    "# Pangolin Private Resource Definitions",
+    "# Auto-generated by generate-dns-config.py",
+    "# Source: HTTPRoute, GRPCRoute, TLSRoute and Gateway manifests in kubernetes/",
+    "#",
+    "# DO NOT EDIT MANUALLY - changes will be overwritten",
+    "# To customize: edit the route manifests or the generator script",
+    "",
+]
+
+# Output buffer for streamed config writes
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+# Per-phase timings for --timings: phase -> {seconds, calls, peak_rss_kb}
+PHASE_TIMINGS: dict[str, dict] = {}
+_phase_stack: list[list[float]] = []
+
+
+def peak_rss_kb() -> int:
+    """Return this process's peak resident set size in KiB (0 if unknown)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KiB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+@contextlib.contextmanager
+def timed(phase: str):
+    """Accumulate wall time for a phase into PHASE_TIMINGS.
+
+    Time spent in nested timed() phases is attributed to the inner phase
+    only, so the report adds up to the total.
+    """
+    start = time.perf_counter()
+    _phase_stack.append([0.0])
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = _phase_stack.pop()[0]
+        if _phase_stack:
+            _phase_stack[-1][0] += elapsed
+        entry = PHASE_TIMINGS.setdefault(phase, {"seconds": 0.0, "calls": 0, "peak_rss_kb": 0})
+        entry["seconds"] += elapsed - nested
+        entry["calls"] += 1
+        entry["peak_rss_kb"] = peak_rss_kb()
+
+
+def print_timings() -> None:
+    """Print the PHASE_TIMINGS table."""
+    total = sum(entry["seconds"] for entry in PHASE_TIMINGS.values())
+    print(f"\n{'Phase':<12} {'Wall time':>12} {'Share':>7} {'Peak RSS':>12}")
+    print("-" * 46)
+    for phase, entry in PHASE_TIMINGS.items():
+        share = entry["seconds"] / total * 100 if total else 0.0
+        print(
+            f"{phase:<12} {entry['seconds'] * 1000:>9.1f} ms {share:>6.1f}% "
+            f"{entry['peak_rss_kb'] / 1024:>8.1f} MiB"
+        )
+    print(f"{'total':<12} {total * 1000:>9.1f} ms")
+
 
 def get_category_from_path(file_path: str) -> str:
     """Determine category based on file path."""
@@ -82,222 +261,849 @@ def find_repo_root() -> Path:
     return Path(__file__).resolve().parent.parent
 
 
-def scan_httproutes(repo_root: Path, verbose: bool = False) -> list[dict]:
-    """Scan HTTPRoute manifests to discover services and their hostnames."""
-    services = []
-    seen_hostnames = set()
+class ScanCache:
+    """Persistent per-file cache of data extracted from route manifests.
 
-    # Scan all directories for HTTPRoute files
-    for yaml_file in repo_root.rglob("*httproute*.yaml"):
-        if ".git" in str(yaml_file):
-            continue
+    Entries are keyed by path relative to the repo root and validated by
+    mtime and size first, then by SHA-256 of the content, so a touched but
+    unmodified file is not re-parsed either.
+    """
 
+    def __init__(self, path: Path | None):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self.seen: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+
+        if path is None or not path.exists():
+            return
         try:
-            content = yaml_file.read_text()
-            for doc in yaml.safe_load_all(content):
-                if not doc:
-                    continue
-                if doc.get("kind") != "HTTPRoute":
-                    continue
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return
+        if data.get("version") == SCAN_CACHE_VERSION:
+            self.entries = data.get("files", {})
+
+    def lookup(self, rel_path: str, stat, sha256: str | None = None) -> dict | None:
+        """Return the cached entry if it is still valid for this file.
+
+        sha256 is the hex digest of the file's current content, if known.
+        """
+        entry = self.entries.get(rel_path)
+        if entry is None:
+            return None
+        if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return entry
+        if sha256 is not None and entry["sha256"] == sha256:
+            # Content unchanged (e.g. git checkout touched it); refresh the stat key
+            entry["mtime_ns"] = stat.st_mtime_ns
+            entry["size"] = stat.st_size
+            self.dirty = True
+            return entry
+        return None
+
+    def store(self, rel_path: str, stat, sha256: str, entry: dict) -> dict:
+        """Record freshly extracted data for a file with content digest sha256."""
+        entry = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": sha256,
+            **entry,
+        }
+        self.entries[rel_path] = entry
+        self.dirty = True
+        return entry
+
+    def save(self) -> None:
+        """Write the cache back to disk, dropping entries for deleted files."""
+        if self.path is None:
+            return
+        stale = set(self.entries) - self.seen
+        if not self.dirty and not stale:
+            return
+        for rel_path in stale:
+            del self.entries[rel_path]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"version": SCAN_CACHE_VERSION, "files": self.entries}, sort_keys=True)
+        )
+        tmp_path.replace(self.path)
+        self.dirty = False
+
+
+def new_parse_stats() -> dict:
+    """Return an empty counter dict for parse_httproute_file() statistics."""
+    return {
+        "docs_parsed": 0,
+        "docs_skipped": 0,
+        "bytes_parsed": 0,
+        "bytes_skipped": 0,
+        "parse_seconds": 0.0,
+        "filter_seconds": 0.0,
+    }
+
+
+def split_documents(content: bytes) -> list[bytes] | None:
+    """Split a multi-document YAML stream on bare '---' / '...' lines.
+
+    Returns None when the stream uses directives, has content on a
+    document marker line, or leaves a marker inside a chunk after
+    splitting, in which case it must be parsed as a whole.
+    """
+    if UNSAFE_SPLIT_RE.search(content):
+        return None
+    chunks = DOC_SEPARATOR_RE.split(content)
+    if any(DOC_MARKER_RE.search(chunk) for chunk in chunks):
+        return None
+    return chunks
 
-                metadata = doc.get("metadata", {})
-                spec = doc.get("spec", {})
-                hostnames = spec.get("hostnames", [])
-
-                for hostname in hostnames:
-                    if hostname in seen_hostnames:
-                        continue
-                    seen_hostnames.add(hostname)
-
-                    # Determine if it's a full hostname or needs suffix
-                    # Parse the hostname to get service name and suffix
-                    parts = hostname.split(".", 1)
-                    if len(parts) == 2:
-                        name = parts[0]
-                        suffix = parts[1]
-                    else:
-                        name = hostname
-                        suffix = "home-infra.net"
-
-                    # Special case: root domain (e.g., home-infra.net)
-                    if hostname in MANAGED_SUFFIXES:
-                        name = "home"
-                        suffix = hostname
-
-                    service = {
-                        "name": name,
-                        "hostname": hostname,
-                        "ip": INGRESS_IP,
-                        "suffix": suffix,
-                        "category": get_category_from_path(str(yaml_file)),
-                        "file": str(yaml_file.relative_to(repo_root)),
-                        "namespace": metadata.get("namespace", "unknown"),
-                        "is_fqdn": hostname in MANAGED_SUFFIXES,
+
+def gateway_addresses(doc: dict) -> list[str]:
+    """Return the IP addresses a Gateway document requests, in order.
+
+    Uses spec.addresses, falling back to the Cilium LB-IPAM annotation on
+    spec.infrastructure. Unsubstituted Flux variables (${...}) are ignored.
+    """
+    spec = doc.get("spec", {})
+    addresses = [a.get("value", "") for a in spec.get("addresses", []) or []]
+    if not addresses:
+        annotations = dict((spec.get("infrastructure") or {}).get("annotations") or {})
+        annotations.update(doc.get("metadata", {}).get("annotations") or {})
+        ipam = annotations.get("io.cilium/lb-ipam-ips", "")
+        addresses = [a.strip() for a in ipam.split(",")]
+    return [a for a in addresses if a and not a.startswith("${")]
+
+
+def parse_httproute_file(content: bytes, file_path: str) -> tuple[dict, dict]:
+    """Extract routes and gateways from one manifest file.
+
+    Documents whose top-level 'kind:' line names something other than a
+    ROUTE_KINDS kind or Gateway are skipped before being loaded into
+    Python objects.
+
+    Returns:
+        Tuple of (extracted, stats). extracted has 'category', a 'routes'
+        list holding one {'kind', 'namespace', 'hostnames', 'parent_refs'}
+        entry per route document and a 'gateways' list holding one
+        {'namespace', 'name', 'addresses'} entry per Gateway, in file order.
+        stats has the new_parse_stats() counters.
+    """
+    stats = new_parse_stats()
+    start = time.perf_counter()
+    chunks = split_documents(content)
+    if chunks is None:
+        candidates = [content]
+    else:
+        candidates = []
+        for chunk in chunks:
+            match = KIND_RE.search(chunk)
+            if match and match.group(1).decode() not in INDEXED_KINDS:
+                stats["docs_skipped"] += 1
+                stats["bytes_skipped"] += len(chunk)
+            else:
+                candidates.append(chunk)
+    parse_start = time.perf_counter()
+    stats["filter_seconds"] = parse_start - start
+
+    routes = []
+    gateways = []
+    for candidate in candidates:
+        stats["bytes_parsed"] += len(candidate)
+        for doc in yaml.load_all(candidate, Loader=YAML_LOADER):
+            stats["docs_parsed"] += 1
+            if not doc:
+                continue
+            kind = doc.get("kind")
+            if kind not in INDEXED_KINDS:
+                continue
+
+            metadata = doc.get("metadata", {})
+            namespace = metadata.get("namespace", "unknown")
+            if kind == "Gateway":
+                gateways.append({
+                    "namespace": metadata.get("namespace", "default"),
+                    "name": metadata.get("name", ""),
+                    "addresses": gateway_addresses(doc),
+                })
+                continue
+
+            spec = doc.get("spec", {})
+            routes.append({
+                "kind": kind,
+                "namespace": namespace,
+                "hostnames": list(spec.get("hostnames", [])),
+                "parent_refs": [
+                    {
+                        "name": ref.get("name", ""),
+                        "namespace": ref.get("namespace", namespace),
                     }
+                    for ref in spec.get("parentRefs", []) or []
+                    if ref.get("kind", "Gateway") == "Gateway"
+                ],
+            })
+    stats["parse_seconds"] = time.perf_counter() - parse_start
+
+    extracted = {
+        "category": get_category_from_path(file_path),
+        "routes": routes,
+        "gateways": gateways,
+    }
+    return extracted, stats
+
+
+def estimate_time_saved(stats: dict) -> float:
+    """Estimate seconds saved by the pre-filter from the observed parse rate.
+
+    Negative when filtering cost more than the skipped documents would have.
+    """
+    if not stats["bytes_parsed"]:
+        return 0.0
+    per_byte = stats["parse_seconds"] / stats["bytes_parsed"]
+    return per_byte * stats["bytes_skipped"] - stats["filter_seconds"]
+
+
+def parse_manifest(
+    task: tuple[str, str, str | None],
+) -> tuple[str | None, dict | None, dict | None, Exception | None]:
+    """Read and parse one manifest; runs in a pool worker with --jobs.
+
+    task is (path, path relative to the repo root, sha256 of the cached
+    entry or None). A file whose content still has the cached digest is
+    not parsed again.
+
+    Returns:
+        Tuple of (content sha256, extracted data, stats, error); extracted
+        and stats are None if the content is unchanged or on error
+    """
+    path, rel_path, cached_sha256 = task
+    try:
+        content = Path(path).read_bytes()
+    except OSError as e:
+        return None, None, None, e
+    sha256 = hashlib.sha256(content).hexdigest()
+    if sha256 == cached_sha256:
+        return sha256, None, None, None
+    try:
+        extracted, stats = parse_httproute_file(content, "/" + rel_path)
+    except Exception as e:
+        return sha256, None, None, e
+    return sha256, extracted, stats, None
+
+
+def load_httproute_files(
+    files: list[Path],
+    repo_root: Path,
+    cache: ScanCache | None = None,
+    jobs: int = 1,
+    stats: dict | None = None,
+    changed: set[str] | None = None,
+) -> list[tuple[Path, dict | None, Exception | None]]:
+    """Return extracted route data for each file, in the order given.
+
+    Scan cache entries whose stat key still matches are reused; remaining
+    files are read, hashed and (if their content changed) parsed serially
+    or, with jobs > 1, across a process pool in chunks, so the parent never
+    reads or ships file contents. Results are merged back in input order
+    so callers see the same sequence either way. Parse counters are added
+    to stats (see new_parse_stats()) if given.
+
+    Files in changed (relative paths) skip the mtime/size check and are
+    always re-hashed, as --check does for the staged files it is given, whose
+    stat key alone may not reveal an edit.
+
+    Returns:
+        List of (path, extracted data or None, parse error or None)
+    """
+    results: list[list] = []
+    pending: list[tuple[int, str, object]] = []
+    tasks: list[tuple[str, str, str | None]] = []
+
+    for yaml_file in files:
+        rel_path = str(yaml_file.relative_to(repo_root))
+        try:
+            stat = yaml_file.stat()
+        except OSError as e:
+            results.append([yaml_file, None, e])
+            continue
+        cached_sha256 = None
+        if cache is not None:
+            cache.seen.add(rel_path)
+            entry = None if changed and rel_path in changed else cache.lookup(rel_path, stat)
+            if entry is not None:
+                cache.hits += 1
+                results.append([yaml_file, entry, None])
+                continue
+            cached_sha256 = cache.entries.get(rel_path, {}).get("sha256")
+
+        pending.append((len(results), rel_path, stat))
+        tasks.append((str(yaml_file), rel_path, cached_sha256))
+        results.append([yaml_file, None, None])
+
+    if jobs > 1 and len(tasks) > 1:
+        workers = min(jobs, len(tasks))
+        # A few chunks per worker keeps IPC low while still balancing load
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(parse_manifest, tasks, chunksize=chunksize))
+    else:
+        parsed = [parse_manifest(task) for task in tasks]
+
+    for (index, rel_path, stat), (sha256, extracted, file_stats, error) in zip(pending, parsed):
+        if stats is not None and file_stats is not None:
+            for key, value in file_stats.items():
+                stats[key] += value
+        if cache is not None and error is None:
+            if extracted is None:
+                # Touched but unmodified; lookup() refreshes the stat key
+                cache.hits += 1
+                extracted = cache.lookup(rel_path, stat, sha256)
+            else:
+                cache.misses += 1
+                extracted = cache.store(rel_path, stat, sha256, extracted)
+        results[index][1] = extracted
+        results[index][2] = error
+
+    return [tuple(result) for result in results]
+
+
+def is_manifest_name(filename: str) -> bool:
+    """Check whether a filename matches one of MANIFEST_PATTERNS."""
+    return any(fnmatch.fnmatchcase(filename, pattern) for pattern in MANIFEST_PATTERNS)
 
-                    if verbose:
-                        print(f"  {name:<15} {hostname:<35} ({service['file']})")
 
-                    services.append(service)
+def is_excluded_dir(name: str, directory: Path, repo_root: Path) -> bool:
+    """Check whether the subdirectory name of directory should be skipped."""
+    if name in DISCOVERY_EXCLUDE_DIRS:
+        return True
+    return name in DISCOVERY_EXCLUDE_ROOTS and directory == repo_root
 
-        except Exception as e:
+
+def is_excluded_path(rel_path: str) -> bool:
+    """Check whether a relative path lies under an excluded directory."""
+    parts = rel_path.split("/")[:-1]
+    if parts and parts[0] in DISCOVERY_EXCLUDE_ROOTS:
+        return True
+    return any(part in DISCOVERY_EXCLUDE_DIRS for part in parts)
+
+
+def discover_manifests_git(repo_root: Path) -> list[Path] | None:
+    """List candidate manifests from the git index plus untracked files.
+
+    Returns None if git is unavailable or repo_root is not a work tree,
+    so the caller can fall back to walking the filesystem.
+    """
+    try:
+        result = subprocess.run(
+            [
+                "git", "-C", str(repo_root), "ls-files", "-z",
+                "--cached", "--others", "--exclude-standard",
+                "--", *(f":(glob)**/{pattern}" for pattern in MANIFEST_PATTERNS),
+            ],
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    files = []
+    for rel_path in sorted(set(result.stdout.decode().split("\0"))):
+        if not rel_path or is_excluded_path(rel_path):
+            continue
+        path = repo_root / rel_path
+        # Index entries for files deleted in the work tree
+        if path.is_file():
+            files.append(path)
+    return files
+
+
+def discover_manifests_walk(repo_root: Path) -> list[Path]:
+    """Walk the tree with os.scandir, pruning excluded directories."""
+    files = []
+    stack = [repo_root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not is_excluded_dir(entry.name, directory, repo_root):
+                    stack.append(Path(entry.path))
+            elif is_manifest_name(entry.name):
+                files.append(Path(entry.path))
+    return sorted(files)
+
+
+def discover_manifests(repo_root: Path, backend: str = "auto") -> tuple[list[Path], str]:
+    """Find route and Gateway manifest candidates.
+
+    Args:
+        repo_root: Repository root directory
+        backend: 'git', 'walk', or 'auto' (git, falling back to walk)
+
+    Returns:
+        Tuple of (sorted manifest paths, backend actually used)
+    """
+    if backend in ("auto", "git"):
+        files = discover_manifests_git(repo_root)
+        if files is not None:
+            return files, "git"
+        if backend == "git":
+            raise RuntimeError(f"git ls-files failed in {repo_root}")
+    return discover_manifests_walk(repo_root), "walk"
+
+
+def resolve_changed_paths(repo_root: Path, paths: list[str]) -> set[str]:
+    """Return the --check FILE arguments as paths relative to repo_root.
+
+    Paths outside the repository are ignored.
+    """
+    changed = set()
+    for path in paths:
+        full_path = Path(path)
+        if not full_path.is_absolute():
+            full_path = Path.cwd() / full_path
+        try:
+            changed.add(str(full_path.resolve().relative_to(repo_root)))
+        except ValueError:
+            continue
+    return changed
+
+
+@dataclass(frozen=True, slots=True)
+class Service:
+    """One published hostname and where it points."""
+
+    name: str
+    hostname: str
+    ip: str
+    suffix: str
+    category: str
+    file: str
+    namespace: str | None = None
+    is_fqdn: bool = False
+    kind: str | None = None
+    gateway: str | None = None
+    via_gateway: bool = False
+    aliases: tuple[str, ...] = ()
+
+
+class ServiceRegistry:
+    """Services in discovery order, indexed by hostname and category.
+
+    Hostnames are unique: add() keeps the first service for a hostname and
+    returns it for later duplicates, so callers can report conflicts.
+    """
+
+    def __init__(self, services: Iterable[Service] = ()):
+        self.services: list[Service] = []
+        self.by_hostname: dict[str, Service] = {}
+        self.by_category: dict[str, list[Service]] = {}
+        for service in services:
+            self.add(service)
+
+    def __len__(self) -> int:
+        return len(self.services)
+
+    def __iter__(self) -> Iterator[Service]:
+        return iter(self.services)
+
+    def __contains__(self, hostname: str) -> bool:
+        return hostname in self.by_hostname
+
+    def get(self, hostname: str) -> Service | None:
+        """Return the service publishing hostname, if any."""
+        return self.by_hostname.get(hostname)
+
+    def add(self, service: Service) -> Service | None:
+        """Add a service unless its hostname is already registered.
+
+        Returns:
+            None if added, otherwise the existing service for the hostname
+        """
+        existing = self.by_hostname.get(service.hostname)
+        if existing is not None:
+            return existing
+
+        self.services.append(service)
+        self.by_hostname[service.hostname] = service
+        self.by_category.setdefault(service.category, []).append(service)
+        return None
+
+
+def register(registry: ServiceRegistry, service: Service) -> bool:
+    """Add service to registry, warning when its hostname already points elsewhere.
+
+    Returns True if the service was added (first source for its hostname).
+    """
+    existing = registry.add(service)
+    if existing is None:
+        return True
+    if existing.ip != service.ip:
+        print(
+            f"  Warning: {service.hostname} -> {service.ip} in {service.file} conflicts "
+            f"with {existing.ip} from {existing.file}; keeping the first"
+        )
+    return False
+
+
+def scan_httproutes(
+    repo_root: Path,
+    verbose: bool = False,
+    cache: ScanCache | None = None,
+    files: list[Path] | None = None,
+    jobs: int = 1,
+    stats: dict | None = None,
+    changed: set[str] | None = None,
+) -> ServiceRegistry:
+    """Scan Gateway API manifests to discover services and their hostnames.
+
+    Routes (HTTPRoute, GRPCRoute, TLSRoute) and Gateways are indexed in a
+    single pass over the files; each hostname then resolves to the address
+    of the first Gateway in its route's parentRefs that has one, or to
+    INGRESS_IP when none does.
+
+    If files is None, manifests are discovered with discover_manifests().
+    With jobs > 1, manifests are parsed in a process pool; hostname
+    de-duplication still follows file order, so output is identical.
+    changed is passed to load_httproute_files().
+    """
+    services = ServiceRegistry()
+
+    if files is None:
+        files, _ = discover_manifests(repo_root)
+
+    # Single pass: index gateways and collect routes in file order
+    gateways: dict[tuple[str, str], list[str]] = {}
+    routes: list[tuple[str, str, dict]] = []
+    with timed("parse"):
+        loaded = load_httproute_files(files, repo_root, cache, jobs, stats, changed)
+
+    for yaml_file, extracted, error in loaded:
+        if error is not None:
             if verbose:
-                print(f"  Warning: Failed to parse {yaml_file}: {e}")
+                print(f"  Warning: Failed to parse {yaml_file}: {error}")
             continue
 
+        rel_path = str(yaml_file.relative_to(repo_root))
+        for gateway in extracted["gateways"]:
+            gateways[(gateway["namespace"], gateway["name"])] = gateway["addresses"]
+        for route in extracted["routes"]:
+            routes.append((rel_path, extracted["category"], route))
+
+    for rel_path, category, route in routes:
+        gateway_key = None
+        ip = INGRESS_IP
+        for ref in route["parent_refs"]:
+            addresses = gateways.get((ref["namespace"], ref["name"]))
+            if addresses:
+                gateway_key = f"{ref['namespace']}/{ref['name']}"
+                ip = addresses[0]
+                break
+
+        for hostname in route["hostnames"]:
+            # Determine if it's a full hostname or needs suffix
+            # Parse the hostname to get service name and suffix
+            parts = hostname.split(".", 1)
+            if len(parts) == 2:
+                name = parts[0]
+                suffix = parts[1]
+            else:
+                name = hostname
+                suffix = "home-infra.net"
+
+            # Special case: root domain (e.g., home-infra.net)
+            if hostname in MANAGED_SUFFIXES:
+                name = "home"
+                suffix = hostname
+
+            service = Service(
+                name=name,
+                hostname=hostname,
+                ip=ip,
+                suffix=suffix,
+                category=category,
+                file=rel_path,
+                namespace=route["namespace"],
+                is_fqdn=hostname in MANAGED_SUFFIXES,
+                kind=route["kind"],
+                gateway=gateway_key,
+                via_gateway=True,
+            )
+            if not register(services, service):
+                continue
+
+            if verbose:
+                print(f"  {name:<15} {hostname:<35} -> {ip:<15} ({service.file})")
+
     return services
 
 
-def build_service_registry(repo_root: Path, verbose: bool = False) -> list[dict]:
+def build_service_registry(
+    repo_root: Path,
+    verbose: bool = False,
+    cache: ScanCache | None = None,
+    files: list[Path] | None = None,
+    jobs: int = 1,
+    stats: dict | None = None,
+    changed: set[str] | None = None,
+) -> ServiceRegistry:
     """Build a complete registry of services from HTTPRoutes and static resources."""
-    services = scan_httproutes(repo_root, verbose)
+    services = scan_httproutes(repo_root, verbose, cache, files, jobs, stats, changed)
 
     # Add static resources (external infrastructure not managed by Kubernetes)
     for name, info in STATIC_RESOURCES.items():
         for suffix in info.get("suffixes", ["home-infra.net"]):
-            hostname = f"{name}.{suffix}"
-            service = {
-                "name": name,
-                "hostname": hostname,
-                "ip": info["ip"],  # Static resources use direct IP
-                "suffix": suffix,
-                "category": info["category"],
-                "file": "static",
-                "namespace": None,
-                "is_fqdn": False,
-                "aliases": info.get("aliases", []),
-            }
             if verbose:
                 print(f"  {name:<15} {info['ip']:<15} -> (static)")
-            services.append(service)
+            register(services, Service(
+                name=name,
+                hostname=f"{name}.{suffix}",
+                ip=info["ip"],  # Static resources use direct IP
+                suffix=suffix,
+                category=info["category"],
+                file="static",
+                aliases=tuple(info.get("aliases", [])),
+            ))
 
             # Add aliases
             for alias in info.get("aliases", []):
-                alias_hostname = f"{alias}.{suffix}"
-                alias_service = {
-                    "name": alias,
-                    "hostname": alias_hostname,
-                    "ip": info["ip"],
-                    "suffix": suffix,
-                    "category": info["category"],
-                    "file": "static-alias",
-                    "namespace": None,
-                    "is_fqdn": False,
-                }
-                services.append(alias_service)
+                register(services, Service(
+                    name=alias,
+                    hostname=f"{alias}.{suffix}",
+                    ip=info["ip"],
+                    suffix=suffix,
+                    category=info["category"],
+                    file="static-alias",
+                ))
 
     return services
 
 
-def generate_controld_config(services: list[dict]) -> str:
-    """Generate domains.yaml content for ControlD.
+def payload_digest(content: str) -> str:
+    """Return the SHA-256 digest of a generated file's payload.
 
-    All web services route through Gateway API (INGRESS_IP) for HTTPS termination.
-    Static resources (proxmox, nas) use their direct IPs.
+    The payload is everything from the first line that is neither blank nor
+    a comment, so header changes (timestamp, digest) don't affect it.
+    """
+    lines = content.splitlines()
+    for index, line in enumerate(lines):
+        if line.strip() and not line.startswith("#"):
+            lines = lines[index:]
+            break
+    else:
+        lines = []
+    return "sha256:" + hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+
+def payload_lines_digest(lines: Iterable[str]) -> str:
+    """Return payload_digest() of "\n".join(lines) without building the string.
+
+    As with splitlines(), a single trailing empty line is not digested.
+    """
+    digest = hashlib.sha256()
+    held = None
+    separator = b""
+    for line in lines:
+        if held is not None:
+            digest.update(separator + held.encode())
+            separator = b"\n"
+        held = line
+    if held:
+        digest.update(separator + held.encode())
+    return "sha256:" + digest.hexdigest()
+
+
+def write_config(handle: TextIO, preamble: list[str], lines: Iterable[str], digest: str) -> None:
+    """Write header comments and payload lines to handle as they are produced.
+
+    The header is stamped with the time and the payload digest (from
+    payload_lines_digest()), which lets the sync scripts tell cheaply
+    whether anything changed.
     """
     now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    stamp = [f"# Generated: {now}", f"# Digest: {digest}"]
+    for line in preamble[:3] + stamp + preamble[3:]:
+        handle.write(line + "\n")
+    separator = ""
+    for line in lines:
+        handle.write(separator + line)
+        separator = "\n"
+
+
+def render_with_header(preamble: list[str], lines: list[str]) -> str:
+    """Render header comments and payload lines to a string (see write_config())."""
+    buffer = io.StringIO()
+    write_config(buffer, preamble, lines, payload_lines_digest(lines))
+    return buffer.getvalue()
+
 
-    lines = [
-        "# ControlD DNS Domain Definitions",
-        "# Auto-generated by generate-dns-config.py",
-        "# Source: HTTPRoute manifests in kubernetes/",
-        f"# Generated: {now}",
-        "#",
-        "# DO NOT EDIT MANUALLY - changes will be overwritten",
-        "# To customize: edit HTTPRoutes or the generator script",
-        "#",
-        "# Routing architecture:",
-        f"#   *.home-infra.net, *.reynoza.org -> {INGRESS_IP} (Cilium Gateway API, HTTPS)",
-        "#   Static resources (proxmox, nas) -> direct IPs",
-        "",
-        "domains:",
+def write_config_if_changed(
+    path: Path, preamble: list[str], render_lines: Callable[[], Iterator[str]]
+) -> tuple[bool, str]:
+    """Stream a config to path unless the file already holds the same payload.
+
+    render_lines is called once to compute the digest and, if the payload
+    changed, once more to write it through a buffered temp file.
+
+    Returns:
+        Tuple of (whether the file was written, payload digest)
+    """
+    digest = payload_lines_digest(render_lines())
+    if path.exists() and payload_digest(path.read_text()) == digest:
+        return False, digest
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", buffering=WRITE_BUFFER_SIZE) as handle:
+        write_config(handle, preamble, render_lines(), digest)
+    tmp_path.replace(path)
+    return True, digest
+
+
+def group_by_category(services: Iterable[Service]) -> list[tuple[str, list[Service]]]:
+    """Group services by category in CATEGORY_ORDER, sorted by hostname."""
+    if not isinstance(services, ServiceRegistry):
+        services = ServiceRegistry(services)
+
+    return [
+        (category, sorted(services.by_category[category], key=lambda x: x.hostname))
+        for category in CATEGORY_ORDER
+        if category in services.by_category
     ]
 
-    # Group by category
-    by_category: dict[str, list[dict]] = {}
-    for svc in services:
-        cat = svc["category"]
-        if cat not in by_category:
-            by_category[cat] = []
-        by_category[cat].append(svc)
 
-    for category in CATEGORY_ORDER:
-        if category not in by_category:
-            continue
+def build_registry(
+    services: ServiceRegistry, groups: list[tuple[str, list[Service]]] | None = None
+) -> dict:
+    """Build the machine-readable registry written by --registry-out.
 
-        # Category header
-        header = category.replace("-", " ").title()
-        lines.append(f"  # {'=' * 74}")
-        lines.append(f"  # {header}")
-        lines.append(f"  # {'=' * 74}")
+    'domains' and 'resources' hold exactly the entries rendered to
+    domains.yaml and resources.yaml, in the same order, so the sync scripts
+    can load either format interchangeably. groups is the result of
+    group_by_category(services), if already computed.
+    """
+    domains = []
+    resources = []
+    seen_names = set()
+
+    if groups is None:
+        groups = group_by_category(services)
+    for category, category_services in groups:
+        for svc in category_services:
+            domain = {"name": svc.name, "ip": svc.ip, "category": category}
+            if svc.is_fqdn:
+                domain["fqdn"] = svc.hostname
+            else:
+                domain["suffixes"] = [svc.suffix]
+            domains.append(domain)
+
+            if svc.name in seen_names:
+                continue
+            seen_names.add(svc.name)
+            resources.append({"name": svc.name, "destination": svc.ip, "category": category})
+
+    registry = {
+        "schema": REGISTRY_SCHEMA,
+        "schema_version": REGISTRY_SCHEMA_VERSION,
+        "domains": domains,
+        "resources": resources,
+    }
+    registry["digest"] = "sha256:" + hashlib.sha256(
+        json.dumps(registry, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+    return registry
+
+
+def encode_registry(registry: dict, path: Path) -> bytes:
+    """Serialize the registry as msgpack (*.msgpack) or compact JSON."""
+    if path.suffix == ".msgpack":
+        if msgpack is None:
+            print("Error: msgpack is required for .msgpack output. Install with: pip install msgpack")
+            sys.exit(1)
+        return msgpack.packb(registry)
+    return json.dumps(registry, sort_keys=True, separators=(",", ":")).encode() + b"\n"
+
+
+def category_header_lines(category: str) -> list[str]:
+    """Return the comment block that introduces a category."""
+    header = category.replace("-", " ").title()
+    return [f"  # {'=' * 74}", f"  # {header}", f"  # {'=' * 74}"]
+
+
+def iter_controld_lines(groups: list[tuple[str, list[Service]]]) -> Iterator[str]:
+    """Yield domains.yaml payload lines from group_by_category() output.
+
+    All web services route through Gateway API (INGRESS_IP) for HTTPS termination.
+    Static resources (proxmox, nas) use their direct IPs.
+    """
+    yield "domains:"
+    for category, category_services in groups:
+        yield from category_header_lines(category)
 
-        for svc in sorted(by_category[category], key=lambda x: x["hostname"]):
-            lines.append(f"  - name: {svc['name']}")
-            lines.append(f"    ip: {svc['ip']}")
+        for svc in category_services:
+            yield f"  - name: {svc.name}"
+            yield f"    ip: {svc.ip}"
 
             # Handle FQDN vs suffix-based hostname
-            if svc.get("is_fqdn"):
-                lines.append(f"    fqdn: {svc['hostname']}")
+            if svc.is_fqdn:
+                yield f"    fqdn: {svc.hostname}"
             else:
-                lines.append(f"    suffixes: [{svc['suffix']}]")
+                yield f"    suffixes: [{svc.suffix}]"
 
             # Add comment about routing
-            if svc["ip"] == INGRESS_IP:
-                lines.append("    # HTTPS via Gateway API")
+            if svc.via_gateway:
+                yield "    # HTTPS via Gateway API"
             else:
-                lines.append("    # Direct IP access")
-            lines.append("")
+                yield "    # Direct IP access"
+            yield ""
 
-    return "\n".join(lines)
 
+def iter_pangolin_lines(groups: list[tuple[str, list[Service]]]) -> Iterator[str]:
+    """Yield resources.yaml payload lines from group_by_category() output."""
+    yield "resources:"
 
-def generate_pangolin_config(services: list[dict]) -> str:
-    """Generate resources.yaml content for Pangolin."""
-    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    # Track seen names to avoid duplicates
+    seen_names = set()
 
-    lines = [
-        "# Pangolin Private Resource Definitions",
-        "# Auto-generated by generate-dns-config.py",
-        "# Source: HTTPRoute manifests in kubernetes/",
-        f"# Generated: {now}",
-        "#",
-        "# DO NOT EDIT MANUALLY - changes will be overwritten",
-        "# To customize: edit HTTPRoutes or the generator script",
-        "",
-        "resources:",
-    ]
+    for category, category_services in groups:
+        yield from category_header_lines(category)
 
-    # Group by category
-    by_category: dict[str, list[dict]] = {}
-    for svc in services:
-        cat = svc["category"]
-        if cat not in by_category:
-            by_category[cat] = []
-        by_category[cat].append(svc)
+        for svc in category_services:
+            if svc.name in seen_names:
+                continue
+            seen_names.add(svc.name)
 
-    # Track seen names to avoid duplicates
-    seen_names = set()
+            yield f"  - name: {svc.name}"
+            yield f"    destination: {svc.ip}"
+            yield ""
 
-    for category in CATEGORY_ORDER:
-        if category not in by_category:
-            continue
 
-        # Category header
-        header = category.replace("-", " ").title()
-        lines.append(f"  # {'=' * 74}")
-        lines.append(f"  # {header}")
-        lines.append(f"  # {'=' * 74}")
+def generate_controld_config(
+    services: ServiceRegistry, groups: list[tuple[str, list[Service]]] | None = None
+) -> str:
+    """Generate domains.yaml content for ControlD.
 
-        for svc in sorted(by_category[category], key=lambda x: x["hostname"]):
-            if svc["name"] in seen_names:
-                continue
-            seen_names.add(svc["name"])
+    groups is the result of group_by_category(services), if already computed.
+    """
+    if groups is None:
+        groups = group_by_category(services)
+    return render_with_header(CONTROLD_PREAMBLE, list(iter_controld_lines(groups)))
 
-            lines.append(f"  - name: {svc['name']}")
-            lines.append(f"    destination: {svc['ip']}")
-            lines.append("")
 
-    return "\n".join(lines)
+def generate_pangolin_config(
+    services: ServiceRegistry, groups: list[tuple[str, list[Service]]] | None = None
+) -> str:
+    """Generate resources.yaml content for Pangolin.
+
+    groups is the result of group_by_category(services), if already computed.
+    """
+    if groups is None:
+        groups = group_by_category(services)
+    return render_with_header(PANGOLIN_PREAMBLE, list(iter_pangolin_lines(groups)))
 
 
 def show_diff(current_content: str, new_content: str, filename: str) -> bool:
@@ -305,11 +1111,8 @@ def show_diff(current_content: str, new_content: str, filename: str) -> bool:
     current_lines = current_content.splitlines(keepends=True)
     new_lines = new_content.splitlines(keepends=True)
 
-    # Skip timestamp line in comparison
-    def strip_generated_line(lines):
-        return [l for l in lines if not l.startswith("# Generated:")]
-
-    if strip_generated_line(current_lines) == strip_generated_line(new_lines):
+    # Compare payloads only (ignores the Generated/Digest header lines)
+    if payload_digest(current_content) == payload_digest(new_content):
         return False
 
     diff = difflib.unified_diff(
@@ -322,9 +1125,403 @@ def show_diff(current_content: str, new_content: str, filename: str) -> bool:
     return True
 
 
+def entry_map(entries: list[dict], kind: str) -> dict[str, str]:
+    """Key generated entries for comparison.
+
+    domains: every hostname an entry publishes (fqdn, or name/aliases under
+    each suffix) -> IP. resources: name -> destination (first one wins, as
+    in Pangolin).
+    """
+    mapping: dict[str, str] = {}
+    for entry in entries:
+        if kind == "resources":
+            mapping.setdefault(entry["name"], entry.get("destination", entry.get("ip", "")))
+            continue
+        if "fqdn" in entry:
+            fqdns = entry["fqdn"] if isinstance(entry["fqdn"], list) else [entry["fqdn"]]
+            for fqdn in fqdns:
+                mapping[fqdn] = entry["ip"]
+            continue
+        for suffix in entry.get("suffixes", ["home-infra.net"]):
+            for name in [entry["name"], *entry.get("aliases", [])]:
+                mapping[f"{name}.{suffix}"] = entry["ip"]
+    return mapping
+
+
+def semantic_diff(current_content: str, new_entries: list[dict], kind: str) -> dict:
+    """Compare an existing generated file with new entries, keyed by hostname/name.
+
+    Linear in the number of entries. Returns a dict with sorted 'added',
+    'removed' ({key: value}) and 'changed' ({key: {'from', 'to'}}) maps.
+    """
+    current_data = yaml.load(current_content, Loader=YAML_LOADER) or {}
+    old = entry_map(current_data.get(kind) or [], kind)
+    new = entry_map(new_entries, kind)
+    return {
+        "added": {key: new[key] for key in sorted(new.keys() - old.keys())},
+        "removed": {key: old[key] for key in sorted(old.keys() - new.keys())},
+        "changed": {
+            key: {"from": old[key], "to": new[key]}
+            for key in sorted(old.keys() & new.keys())
+            if old[key] != new[key]
+        },
+    }
+
+
+def print_semantic_diff(diff: dict) -> None:
+    """Print a semantic_diff() result as +/-/~ lines."""
+    for key, value in diff["added"].items():
+        print(f"  + {key:<40} -> {value}")
+    for key, value in diff["removed"].items():
+        print(f"  - {key:<40} (was {value})")
+    for key, change in diff["changed"].items():
+        print(f"  ~ {key:<40} {change['from']} -> {change['to']}")
+    print(
+        f"Added: {len(diff['added'])}, removed: {len(diff['removed'])}, "
+        f"changed: {len(diff['changed'])}"
+    )
+
+
+def diff_output(
+    current_content: str,
+    new_content: str,
+    new_entries: list[dict],
+    kind: str,
+    filename: str,
+    args: argparse.Namespace,
+    diffs: dict,
+) -> None:
+    """Report differences for one output according to --diff-mode/--format."""
+    if args.diff_mode == "text":
+        if not show_diff(current_content, new_content, filename):
+            print("No changes")
+        return
+
+    diff = semantic_diff(current_content, new_entries, kind)
+    diff["reformatted"] = payload_digest(current_content) != payload_digest(new_content)
+    diffs[filename] = diff
+    if args.format == "json":
+        return
+    if diff["added"] or diff["removed"] or diff["changed"]:
+        print_semantic_diff(diff)
+    elif diff["reformatted"]:
+        print("No entry changes (ordering/formatting only)")
+    else:
+        print("No changes")
+
+
+def selected_outputs(
+    args: argparse.Namespace, controld_path: Path, pangolin_path: Path
+) -> list[tuple[str, Path, str, str, list[str], Callable]]:
+    """Return the outputs selected by --controld-only/--pangolin-only.
+
+    Returns:
+        List of (title, path, display filename, kind, preamble, line renderer)
+    """
+    outputs = []
+    if not args.pangolin_only:
+        outputs.append((
+            "ControlD domains.yaml", controld_path, "scripts/controld/domains.yaml",
+            "domains", CONTROLD_PREAMBLE, iter_controld_lines,
+        ))
+    if not args.controld_only:
+        outputs.append((
+            "Pangolin resources.yaml", pangolin_path, "scripts/pangolin/resources.yaml",
+            "resources", PANGOLIN_PREAMBLE, iter_pangolin_lines,
+        ))
+    return outputs
+
+
+def check_outputs(
+    services: ServiceRegistry, args: argparse.Namespace, controld_path: Path, pangolin_path: Path
+) -> bool:
+    """Check whether the generated files are up to date.
+
+    Compares payload digests only, so the Generated/Digest header lines
+    never cause a failure. Returns True if every selected output is current.
+    """
+    current = True
+    with timed("render"):
+        groups = group_by_category(services)
+        outputs = selected_outputs(args, controld_path, pangolin_path)
+        for _, path, filename, _, _, render_lines in outputs:
+            digest = payload_lines_digest(render_lines(groups))
+            if path.exists() and payload_digest(path.read_text()) == digest:
+                continue
+            print(f"{filename} is out of date")
+            current = False
+    return current
+
+
+def write_outputs(
+    services: ServiceRegistry, args: argparse.Namespace, controld_path: Path, pangolin_path: Path
+) -> dict:
+    """Render both configs and write, diff or print them according to args.
+
+    Services are grouped and sorted once; both outputs are streamed from
+    that index to their file (or stdout for --dry-run) line by line.
+
+    Returns the semantic diffs by filename (empty unless --diff).
+    """
+    diffs: dict[str, dict] = {}
+    with timed("render"):
+        groups = group_by_category(services)
+    registry = None
+    if args.diff and args.diff_mode == "semantic":
+        with timed("registry"):
+            registry = build_registry(services, groups)
+
+    for title, path, filename, kind, preamble, render_lines in selected_outputs(
+        args, controld_path, pangolin_path
+    ):
+        print(f"\n{'=' * 60}")
+        print(title)
+        print("=" * 60)
+
+        if args.diff and path.exists():
+            with timed("render"):
+                content = render_with_header(preamble, list(render_lines(groups)))
+            with timed("diff/write"):
+                diff_output(
+                    path.read_text(), content, registry and registry[kind],
+                    kind, filename, args, diffs,
+                )
+        elif args.dry_run:
+            with timed("render"):
+                digest = payload_lines_digest(render_lines(groups))
+                write_config(sys.stdout, preamble, render_lines(groups), digest)
+                print()
+        else:
+            with timed("diff/write"):
+                written, digest = write_config_if_changed(
+                    path, preamble, lambda: render_lines(groups)
+                )
+            if written:
+                print(f"Written to {path}")
+            else:
+                print(f"Unchanged ({digest[:19]}), not rewritten")
+
+    if args.registry_out and not args.dry_run and not args.diff:
+        with timed("render"):
+            registry_data = encode_registry(build_registry(services, groups), args.registry_out)
+        with timed("diff/write"):
+            if args.registry_out.exists() and args.registry_out.read_bytes() == registry_data:
+                print(f"\nRegistry unchanged, not rewritten: {args.registry_out}")
+            else:
+                args.registry_out.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = args.registry_out.with_suffix(args.registry_out.suffix + ".tmp")
+                tmp_path.write_bytes(registry_data)
+                tmp_path.replace(args.registry_out)
+                print(f"\nRegistry written to {args.registry_out}")
+
+    return diffs
+
+
+class InotifyWatcher:
+    """Watch a directory tree for manifest changes using Linux inotify (via ctypes)."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = (
+        IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+    )
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, repo_root: Path):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.repo_root = repo_root
+        self.watches: dict[int, Path] = {}
+        self.add_tree(repo_root)
+
+    def add_tree(self, directory: Path) -> None:
+        """Add a watch for directory and every non-excluded subdirectory."""
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(current), self.WATCH_MASK)
+            if wd < 0:
+                continue
+            self.watches[wd] = current
+            try:
+                for entry in os.scandir(current):
+                    if entry.is_dir(follow_symlinks=False) and not is_excluded_dir(
+                        entry.name, current, self.repo_root
+                    ):
+                        stack.append(Path(entry.path))
+            except OSError:
+                continue
+
+    def read_events(self, timeout: float | None) -> set[Path] | None:
+        """Wait up to timeout seconds (None = forever) for manifest events.
+
+        Returns the set of touched manifest paths (empty on timeout), or None
+        when directories changed or events were dropped and a full
+        rediscovery is needed. Events for other files are ignored.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self.fd], [], [], wait)
+            if not readable:
+                return set()
+            changed = self.drain_events()
+            if changed is None or changed:
+                return changed
+
+    def drain_events(self) -> set[Path] | None:
+        """Read all queued events; see read_events() for the return value."""
+        changed: set[Path] = set()
+        rescan = False
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode()
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            directory = self.watches.get(wd)
+            if directory is None:
+                continue
+            if mask & self.IN_DELETE_SELF:
+                del self.watches[wd]
+                continue
+            if mask & self.IN_ISDIR:
+                if is_excluded_dir(name, directory, self.repo_root):
+                    continue
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self.add_tree(directory / name)
+                rescan = True
+            elif is_manifest_name(name):
+                changed.add(directory / name)
+
+        return None if rescan else changed
+
+
+class PollingWatcher:
+    """Fallback watcher that re-discovers manifests and compares stat results."""
+
+    def __init__(self, repo_root: Path, interval: float = 1.0):
+        self.repo_root = repo_root
+        self.interval = interval
+        self.snapshot = self.take_snapshot()
+
+    def take_snapshot(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for path in discover_manifests(self.repo_root)[0]:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def read_events(self, timeout: float | None) -> set[Path] | None:
+        """Same contract as InotifyWatcher.read_events()."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.interval
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            time.sleep(wait)
+
+            snapshot = self.take_snapshot()
+            changed = {
+                path for path in set(snapshot) | set(self.snapshot)
+                if snapshot.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+
+def create_watcher(repo_root: Path) -> InotifyWatcher | PollingWatcher:
+    """Use inotify where available, otherwise poll."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(repo_root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(repo_root)
+
+
+def watch(
+    repo_root: Path,
+    args: argparse.Namespace,
+    cache: ScanCache,
+    files: list[Path],
+    jobs: int,
+    controld_path: Path,
+    pangolin_path: Path,
+) -> None:
+    """Stay resident and regenerate outputs whenever manifests change.
+
+    The scan cache is kept in memory between rounds, so only touched files
+    are re-parsed. Events are coalesced until WATCH_DEBOUNCE seconds pass
+    without a new one.
+    """
+    watcher = create_watcher(repo_root)
+    manifests = set(files)
+    backend = "inotify" if isinstance(watcher, InotifyWatcher) else "polling"
+    print(f"\nWatching {len(manifests)} manifests ({backend}). Press Ctrl-C to stop.")
+
+    try:
+        while True:
+            changed = watcher.read_events(None)
+            while changed is not None:
+                more = watcher.read_events(WATCH_DEBOUNCE)
+                if more is None:
+                    changed = None
+                elif not more:
+                    break
+                else:
+                    changed |= more
+
+            if changed is None:
+                manifests = set(discover_manifests(repo_root, args.discovery)[0])
+                print(f"\nDirectory change detected, rediscovered {len(manifests)} manifests")
+            else:
+                for path in changed:
+                    if path.is_file():
+                        manifests.add(path)
+                    else:
+                        manifests.discard(path)
+                print(f"\n{len(changed)} manifest(s) changed, regenerating...")
+
+            cache.hits = cache.misses = 0
+            with timed("registry"):
+                services = build_service_registry(
+                    repo_root, args.verbose, cache, sorted(manifests), jobs
+                )
+            print(f"Discovered {len(services)} services/hostnames ({cache.misses} re-parsed)")
+            write_outputs(services, args, controld_path, pangolin_path)
+            if not args.no_cache:
+                cache.save()
+            if args.timings:
+                print_timings()
+                PHASE_TIMINGS.clear()
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
 def main():
     parser = argparse.ArgumentParser(
-        description="Generate DNS configs from HTTPRoute manifests"
+        description="Generate DNS configs from Gateway API route manifests"
     )
     parser.add_argument(
         "--dry-run",
@@ -336,6 +1533,29 @@ def main():
         action="store_true",
         help="Show diff from current files",
     )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit 1 if the generated files are out of date (for pre-commit)",
+    )
+    parser.add_argument(
+        "changed_files",
+        nargs="*",
+        metavar="FILE",
+        help="With --check: files to re-hash even if their mtime and size match the scan cache",
+    )
+    parser.add_argument(
+        "--diff-mode",
+        choices=["semantic", "text"],
+        default="semantic",
+        help="--diff by hostname (added/removed/changed, default) or as a unified text diff",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format for semantic --diff; json prints one document to stdout",
+    )
     parser.add_argument(
         "--controld-only",
         action="store_true",
@@ -352,58 +1572,134 @@ def main():
         action="store_true",
         help="Show detailed service discovery output",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the scan cache and re-parse every manifest",
+    )
+    parser.add_argument(
+        "--discovery",
+        choices=["auto", "git", "walk"],
+        default="auto",
+        help="How to find manifests: git index, pruned directory walk, or auto (default)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Parse manifests in N worker processes (0 = one per CPU, default: 1)",
+    )
+    parser.add_argument(
+        "--registry-out",
+        type=Path,
+        help="Also write a JSON (or *.msgpack) service registry the sync scripts can load directly",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Report wall time and peak RSS per phase (discovery, parse, registry, render, diff/write)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="PATH",
+        help=f"Run under cProfile and dump pstats to PATH (default: {PROFILE_PATH})",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Stay running and regenerate configs when manifests change",
+    )
 
     args = parser.parse_args()
 
+    if args.changed_files and not args.check:
+        parser.error("FILE arguments are only accepted with --check")
+    if args.check and (args.watch or args.no_cache):
+        parser.error("--check cannot be combined with --watch or --no-cache")
+
+    if args.format == "json":
+        if not args.diff or args.diff_mode != "semantic" or args.watch:
+            parser.error("--format json requires --diff with semantic mode (and no --watch)")
+        # Keep stdout clean for the JSON document
+        with contextlib.redirect_stdout(sys.stderr):
+            diffs = run(args)
+        print(json.dumps(diffs, indent=2))
+        return
+
+    if args.profile is None:
+        run(args)
+        return
+
+    profile_path = Path(args.profile) if args.profile else find_repo_root() / PROFILE_PATH
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run, args)
+    finally:
+        profile_path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(profile_path)
+        print(f"\nProfile written to {profile_path} (top functions by cumulative time):")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+
+
+def run(args: argparse.Namespace) -> dict:
+    """Generate configs according to parsed command-line arguments.
+
+    Returns the semantic diffs from write_outputs() (empty unless --diff).
+    """
     repo_root = find_repo_root()
     controld_path = repo_root / "scripts/controld/domains.yaml"
     pangolin_path = repo_root / "scripts/pangolin/resources.yaml"
 
-    print("Scanning HTTPRoute manifests...")
-    services = build_service_registry(repo_root, args.verbose)
+    cache = ScanCache(None if args.no_cache else repo_root / SCAN_CACHE_PATH)
+
+    changed = resolve_changed_paths(repo_root, args.changed_files) if args.check else None
+    with timed("discovery"):
+        files, backend = discover_manifests(repo_root, args.discovery)
+    print(f"Scanning {len(files)} route/Gateway manifests (discovered via {backend})...")
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    parse_stats = new_parse_stats()
+    with timed("registry"):
+        services = build_service_registry(
+            repo_root, args.verbose, cache, files, jobs, parse_stats, changed
+        )
     print(f"Discovered {len(services)} services/hostnames")
-
-    # Generate configs
-    generate_controld = not args.pangolin_only
-    generate_pangolin = not args.controld_only
-
-    if generate_controld:
-        print(f"\n{'=' * 60}")
-        print("ControlD domains.yaml")
-        print("=" * 60)
-
-        controld_content = generate_controld_config(services)
-
-        if args.diff and controld_path.exists():
-            current = controld_path.read_text()
-            if not show_diff(
-                current, controld_content, "scripts/controld/domains.yaml"
-            ):
-                print("No changes")
-        elif args.dry_run:
-            print(controld_content)
+    if not args.no_cache:
+        print(f"Scan cache: {cache.hits} unchanged, {cache.misses} parsed")
+        with timed("diff/write"):
+            cache.save()
+    if parse_stats["docs_parsed"] or parse_stats["docs_skipped"]:
+        saved = ""
+        if parse_stats["docs_skipped"]:
+            net_ms = estimate_time_saved(parse_stats) * 1000
+            if net_ms > 0:
+                saved = f", ~{net_ms:.1f} ms saved"
+            else:
+                saved = f", ~{-net_ms:.1f} ms net cost"
+        print(
+            f"Pre-filter: skipped {parse_stats['docs_skipped']} unrelated documents, "
+            f"parsed {parse_stats['docs_parsed']} (loader: {YAML_LOADER.__name__}{saved})"
+        )
+
+    if args.watch:
+        watch(repo_root, args, cache, files, jobs, controld_path, pangolin_path)
+        return {}
+
+    if args.check:
+        current = check_outputs(services, args, controld_path, pangolin_path)
+        if current:
+            print("Generated configs are up to date.")
         else:
-            controld_path.write_text(controld_content)
-            print(f"Written to {controld_path}")
+            print("Run ./scripts/generate-dns-config.py and stage the result.")
+        if args.timings:
+            print_timings()
+        if not current:
+            sys.exit(1)
+        return {}
 
-    if generate_pangolin:
-        print(f"\n{'=' * 60}")
-        print("Pangolin resources.yaml")
-        print("=" * 60)
-
-        pangolin_content = generate_pangolin_config(services)
-
-        if args.diff and pangolin_path.exists():
-            current = pangolin_path.read_text()
-            if not show_diff(
-                current, pangolin_content, "scripts/pangolin/resources.yaml"
-            ):
-                print("No changes")
-        elif args.dry_run:
-            print(pangolin_content)
-        else:
-            pangolin_path.write_text(pangolin_content)
-            print(f"Written to {pangolin_path}")
+    diffs = write_outputs(services, args, controld_path, pangolin_path)
 
     if not args.dry_run and not args.diff:
         print("\nDone! Config files generated.")
@@ -411,6 +1707,11 @@ def main():
         print("  ./scripts/controld/controld-dns.py sync --dry-run")
         print("  ./scripts/pangolin/pangolin-resources.py sync --dry-run")
 
+    if args.timings:
+        print_timings()
+
+    return diffs
+
 
 if __name__ == "__main__":
     main()
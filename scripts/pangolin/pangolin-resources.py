@@ -13,6 +13,8 @@ Usage:
     ./scripts/pangolin/pangolin-resources.py sync --clients Ronaldo      # adds to default clients
     ./scripts/pangolin/pangolin-resources.py sync --no-default-clients   # skip default clients
     ./scripts/pangolin/pangolin-resources.py sync --force-client-update  # update clients on all resources
+    ./scripts/pangolin/pangolin-resources.py sync --if-changed           # skip if inputs unchanged
+    ./scripts/pangolin/pangolin-resources.py sync --resume               # retry what a failed sync left
 
 Default clients are configured in config.yaml (default_clients list).
 If a default client doesn't exist in Pangolin, it's skipped with a warning.
@@ -22,6 +24,7 @@ Override with PANGOLIN_API_KEY env var or --token-file argument.
 """
 
 import argparse
+import hashlib
 import json
 import os
 import subprocess
@@ -32,6 +35,10 @@ import urllib.parse
 import urllib.request
 from pathlib import Path
 
+# Shared helpers live next to the per-service script directories
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from sync_common import RateLimiter, SyncJournal, journal_path  # noqa: E402
+
 try:
     import yaml
 except ImportError:
@@ -39,6 +46,21 @@ except ImportError:
     print("Or enter nix-shell which includes it.")
     sys.exit(1)
 
+# Optional: binary registries from generate-dns-config.py --registry-out
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Generator registry format accepted in place of the YAML file
+REGISTRY_SUFFIXES = (".json", ".msgpack")
+REGISTRY_SCHEMA = "dns-service-registry"
+REGISTRY_SCHEMA_VERSION = 1
+
+# Client-side request pacing; halved on each 429 and recovered on success
+RATE_LIMIT_PER_SECOND = 10.0
+RATE_LIMIT_BURST = 10
+
 
 class PangolinClient:
     """Client for Pangolin Integration API."""
@@ -46,8 +68,8 @@ class PangolinClient:
     def __init__(self, api_key: str, base_url: str):
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
-        self.max_retries = 3
-        self.retry_delay = 2
+        self.max_retries = 6
+        self.limiter = RateLimiter(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
 
     def _request(
         self, method: str, endpoint: str, data: dict | None = None
@@ -65,21 +87,22 @@ class PangolinClient:
             body = json.dumps(data).encode()
 
         for attempt in range(self.max_retries):
+            self.limiter.acquire()
             try:
                 req = urllib.request.Request(url, data=body, headers=headers, method=method)
                 with urllib.request.urlopen(req, timeout=30) as response:
+                    self.limiter.on_success(response.headers)
                     return json.loads(response.read().decode())
             except urllib.error.HTTPError as e:
                 if e.code == 429:  # Rate limited
-                    wait = self.retry_delay * (attempt + 1)
-                    print(f"  Rate limited, waiting {wait}s...")
-                    time.sleep(wait)
+                    wait = self.limiter.on_rate_limited(e.headers, attempt)
+                    print(f"  Rate limited, backing off {wait:.1f}s...")
                     continue
                 error_body = e.read().decode() if e.fp else ""
                 raise RuntimeError(f"API error {e.code}: {error_body}") from e
             except urllib.error.URLError as e:
                 if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
+                    time.sleep(self.limiter.backoff(attempt))
                     continue
                 raise RuntimeError(f"Network error: {e.reason}") from e
 
@@ -241,13 +264,84 @@ def load_config(config_path: Path) -> dict:
         return yaml.safe_load(f)
 
 
+def load_registry(registry_path: Path) -> dict:
+    """Load a registry written by generate-dns-config.py --registry-out."""
+    data = registry_path.read_bytes()
+    if registry_path.suffix == ".msgpack":
+        if msgpack is None:
+            raise RuntimeError("msgpack is required to read .msgpack registries (pip install msgpack)")
+        registry = msgpack.unpackb(data)
+    else:
+        registry = json.loads(data)
+
+    if registry.get("schema") != REGISTRY_SCHEMA:
+        raise ValueError(f"{registry_path} is not a {REGISTRY_SCHEMA} file")
+    if registry.get("schema_version") != REGISTRY_SCHEMA_VERSION:
+        raise ValueError(
+            f"Unsupported registry schema version {registry.get('schema_version')} "
+            f"(expected {REGISTRY_SCHEMA_VERSION})"
+        )
+    return registry
+
+
 def load_resources(resources_path: Path) -> list[dict]:
-    """Load resource definitions from YAML file."""
+    """Load resource definitions from YAML file or generator registry.
+
+    Registries (*.json / *.msgpack from generate-dns-config.py --registry-out)
+    are loaded without going through YAML.
+    """
+    if resources_path.suffix in REGISTRY_SUFFIXES:
+        return load_registry(resources_path)["resources"]
     with open(resources_path) as f:
         data = yaml.safe_load(f)
         return data.get("resources", [])
 
 
+def payload_digest(content: str) -> str:
+    """Return the SHA-256 digest of a generated file's payload.
+
+    Must match payload_digest() in generate-dns-config.py: everything from
+    the first line that is neither blank nor a comment.
+    """
+    lines = content.splitlines()
+    for index, line in enumerate(lines):
+        if line.strip() and not line.startswith("#"):
+            lines = lines[index:]
+            break
+    else:
+        lines = []
+    return "sha256:" + hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+
+def compute_source_digest(resources_path: Path, config_path: Path) -> str:
+    """Digest of the local inputs to a sync: resources payload plus config."""
+    if resources_path.suffix in REGISTRY_SUFFIXES:
+        digest = hashlib.sha256(resources_path.read_bytes())
+    else:
+        digest = hashlib.sha256(payload_digest(resources_path.read_text()).encode())
+    digest.update(config_path.read_bytes())
+    return "sha256:" + digest.hexdigest()
+
+
+def load_sync_state(state_path: Path) -> dict:
+    """Load per-site state recorded by previous successful syncs."""
+    try:
+        with open(state_path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {"sites": {}}
+    state.setdefault("sites", {})
+    return state
+
+
+def save_sync_state(state_path: Path, state: dict) -> None:
+    """Write sync state atomically."""
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True))
+    tmp_path.replace(state_path)
+
+
 def build_desired_state(resources: list[dict], config: dict) -> dict[str, dict]:
     """Build desired state from resource definitions.
 
@@ -316,6 +410,158 @@ def resources_match(desired: dict, current: dict) -> bool:
     )
 
 
+def resources_digest(desired: dict[str, dict]) -> str:
+    """Digest of a desired resource set (see build_desired_state()), order-independent."""
+    return "sha256:" + hashlib.sha256(json.dumps(desired, sort_keys=True).encode()).hexdigest()
+
+
+def apply_changes(
+    client: PangolinClient,
+    org_id: str,
+    site_id: int,
+    ops: dict[str, dict],
+    client_ids: list[int],
+    journal: SyncJournal | None = None,
+) -> int:
+    """Apply a sync plan: deletes first, then adds, then updates.
+
+    Args:
+        client: Pangolin API client
+        org_id: Organization ID
+        site_id: Site ID for new resources
+        ops: 'delete' maps name -> resource ID, 'add' maps name -> desired
+            config, 'update' maps name -> desired config plus current 'id'
+            and 'siteId'
+        client_ids: Client IDs to associate with added/updated resources
+        journal: Journal to record each operation's outcome in
+
+    Returns:
+        Number of failed operations
+    """
+    errors = 0
+
+    def record(action: str, name: str, error: Exception | None = None) -> None:
+        nonlocal errors
+        if error is None:
+            print("OK")
+        else:
+            print(f"FAILED: {error}")
+            errors += 1
+        if journal is not None:
+            if error is None:
+                journal.done(action, [name])
+            else:
+                journal.failed(action, [name], error)
+
+    # Delete first
+    for name, resource_id in sorted(ops["delete"].items()):
+        try:
+            print(f"  Deleting {name}...", end=" ")
+            client.delete_site_resource(resource_id)
+        except Exception as e:
+            record("delete", name, e)
+            continue
+        record("delete", name)
+
+    # Then add
+    for name, d in sorted(ops["add"].items()):
+        try:
+            print(f"  Adding {name} -> {d['destination']}...", end=" ")
+            client.create_site_resource(
+                org_id=org_id,
+                name=name,
+                site_id=site_id,
+                mode="host",
+                destination=d["destination"],
+                alias=d["alias"],
+                tcp_ports=d["tcp_ports"],
+                udp_ports=d["udp_ports"],
+                disable_icmp=d["disable_icmp"],
+                enabled=d["enabled"],
+                client_ids=client_ids,
+            )
+        except Exception as e:
+            record("add", name, e)
+            continue
+        record("add", name)
+
+    # Then update
+    for name, d in sorted(ops["update"].items()):
+        try:
+            print(f"  Updating {name}...", end=" ")
+            client.update_site_resource(
+                resource_id=d["id"],
+                site_id=d["siteId"],
+                destination=d["destination"],
+                alias=d["alias"],
+                tcp_ports=d["tcp_ports"],
+                udp_ports=d["udp_ports"],
+                disable_icmp=d["disable_icmp"],
+                enabled=d["enabled"],
+                client_ids=client_ids,
+            )
+        except Exception as e:
+            record("update", name, e)
+            continue
+        record("update", name)
+
+    return errors
+
+
+def finish_sync(errors: int, journal: SyncJournal | None) -> int:
+    """Print the sync result, clearing journal once nothing is outstanding."""
+    if errors:
+        print(f"\nCompleted with {errors} errors")
+        if journal is not None:
+            print("Outstanding changes are journaled; `sync --resume` retries only those")
+        return 1
+
+    if journal is not None:
+        journal.clear()
+    print("\nSync completed successfully!")
+    return 0
+
+
+def resume_sync(
+    client: PangolinClient,
+    org_id: str,
+    desired: dict[str, dict],
+    journal: SyncJournal | None,
+    dry_run: bool,
+) -> int:
+    """Replay the operations a previous sync left outstanding in journal."""
+    pending = journal.outstanding() if journal is not None else None
+    if pending is None:
+        print("No interrupted sync to resume")
+        return 0
+    if pending["digest"] != resources_digest(desired):
+        print(
+            f"Error: desired resources changed since the interrupted sync ({pending['at']}) "
+            "- run a normal sync instead"
+        )
+        return 1
+
+    ops = pending["ops"]
+    print(f"Resuming sync planned at {pending['at']} (site ID: {pending['site_id']})")
+    print(f"\n{'Sync preview (dry-run)' if dry_run else 'Sync changes'}:")
+    print("-" * 80)
+    for name, d in sorted(ops["add"].items()):
+        print(f"  [ADD]    {name:<25} -> {d['destination']}")
+    for name in sorted(ops["update"]):
+        print(f"  [UPDATE] {name}")
+    for name in sorted(ops["delete"]):
+        print(f"  [DELETE] {name}")
+    print(f"\nWould add: {len(ops['add'])}, update: {len(ops['update'])}, delete: {len(ops['delete'])}")
+
+    if dry_run:
+        print("\nDry-run mode - no changes applied.")
+        return 0
+
+    print("\nApplying changes...")
+    errors = apply_changes(client, org_id, pending["site_id"], ops, pending["client_ids"], journal)
+    return finish_sync(errors, journal)
+
+
 def cmd_list_clients(client: PangolinClient, config: dict) -> int:
     """List all clients in Pangolin."""
     org_id = config["org_id"]
@@ -392,12 +638,24 @@ def cmd_sync(
     clients_str: str | None = None,
     no_default_clients: bool = False,
     force_client_update: bool = False,
+    journal: SyncJournal | None = None,
+    resume: bool = False,
 ) -> int:
-    """Sync local config with Pangolin."""
+    """Sync local config with Pangolin.
+
+    Planned and completed changes are recorded in journal if given. With
+    resume, only the changes the journal still lists are replayed, without
+    looking up clients or fetching current resources.
+    """
     site_name = config["site_name"]
     org_id = config["org_id"]
     print(f"Organization: {org_id}")
 
+    # Build desired state
+    desired = build_desired_state(resources, config)
+    if resume:
+        return resume_sync(client, org_id, desired, journal, dry_run)
+
     # Build client list from defaults and command line
     client_ids: list[int] = []
     client_names: list[str] = []
@@ -441,8 +699,6 @@ def cmd_sync(
     site_id = site["siteId"]
     print(f"Site: {site_name} (ID: {site_id})")
 
-    # Build desired state
-    desired = build_desired_state(resources, config)
     print(f"\nDesired state: {len(desired)} resources")
 
     # Get current state
@@ -482,6 +738,9 @@ def cmd_sync(
 
     if not to_add and not to_update and not to_delete:
         print("No changes needed - already in sync!")
+        # Nothing left to resume once remote matches desired
+        if journal is not None and not dry_run:
+            journal.clear()
         return 0
 
     for name in sorted(to_add):
@@ -512,72 +771,20 @@ def cmd_sync(
         return 0
 
     # Apply changes
-    print("\nApplying changes...")
-    errors = 0
-
-    # Delete first
-    for name in sorted(to_delete):
-        try:
-            print(f"  Deleting {name}...", end=" ")
-            resource_id = current[name]["id"]
-            client.delete_site_resource(resource_id)
-            print("OK")
-        except Exception as e:
-            print(f"FAILED: {e}")
-            errors += 1
-
-    # Then add
-    for name in sorted(to_add):
-        try:
-            d = desired[name]
-            print(f"  Adding {name} -> {d['destination']}...", end=" ")
-            client.create_site_resource(
-                org_id=org_id,
-                name=name,
-                site_id=site_id,
-                mode="host",
-                destination=d["destination"],
-                alias=d["alias"],
-                tcp_ports=d["tcp_ports"],
-                udp_ports=d["udp_ports"],
-                disable_icmp=d["disable_icmp"],
-                enabled=d["enabled"],
-                client_ids=client_ids,
-            )
-            print("OK")
-        except Exception as e:
-            print(f"FAILED: {e}")
-            errors += 1
-
-    # Then update
-    for name in sorted(to_update):
-        try:
-            d = desired[name]
-            c = current[name]
-            print(f"  Updating {name}...", end=" ")
-            resource_id = c["id"]
-            client.update_site_resource(
-                resource_id=resource_id,
-                site_id=c["siteId"],
-                destination=d["destination"],
-                alias=d["alias"],
-                tcp_ports=d["tcp_ports"],
-                udp_ports=d["udp_ports"],
-                disable_icmp=d["disable_icmp"],
-                enabled=d["enabled"],
-                client_ids=client_ids,
-            )
-            print("OK")
-        except Exception as e:
-            print(f"FAILED: {e}")
-            errors += 1
+    ops = {
+        "delete": {name: current[name]["id"] for name in sorted(to_delete)},
+        "add": {name: desired[name] for name in sorted(to_add)},
+        "update": {
+            name: {**desired[name], "id": current[name]["id"], "siteId": current[name]["siteId"]}
+            for name in sorted(to_update)
+        },
+    }
+    if journal is not None:
+        journal.plan(resources_digest(desired), ops, site_id=site_id, client_ids=client_ids)
 
-    if errors:
-        print(f"\nCompleted with {errors} errors")
-        return 1
-
-    print("\nSync completed successfully!")
-    return 0
+    print("\nApplying changes...")
+    errors = apply_changes(client, org_id, site_id, ops, client_ids, journal)
+    return finish_sync(errors, journal)
 
 
 def cmd_purge(
@@ -664,7 +871,7 @@ def main():
         "--resources",
         type=Path,
         default=Path(__file__).parent / "resources.yaml",
-        help="Path to resources.yaml",
+        help="Path to resources.yaml, or a registry from generate-dns-config.py --registry-out",
     )
     parser.add_argument(
         "--token-file",
@@ -672,6 +879,18 @@ def main():
         default=default_token_file,
         help="Path to SOPS-encrypted credentials file (default: secrets/pangolin-creds.enc.yaml)",
     )
+    parser.add_argument(
+        "--state-file",
+        type=Path,
+        default=repo_root / ".cache" / "pangolin-resources" / "sync-state.json",
+        help="Path to local sync state (default: .cache/pangolin-resources/sync-state.json)",
+    )
+    parser.add_argument(
+        "--journal-dir",
+        type=Path,
+        default=repo_root / ".cache" / "pangolin-resources" / "journal",
+        help="Directory for per-site sync journals (default: .cache/pangolin-resources/journal)",
+    )
 
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -703,6 +922,16 @@ def main():
         action="store_true",
         help="Force update all resources with the specified clients (or clear if no --clients)",
     )
+    sync_parser.add_argument(
+        "--if-changed",
+        action="store_true",
+        help="Skip the sync if resources.yaml/config.yaml are unchanged since the last sync",
+    )
+    sync_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Replay only the changes an interrupted or failed sync left outstanding",
+    )
 
     # purge command
     purge_parser = subparsers.add_parser("purge", help="Delete all private resources for the site")
@@ -718,6 +947,42 @@ def main():
     )
 
     args = parser.parse_args()
+    if getattr(args, "resume", False) and (
+        args.clients or args.no_default_clients or args.force_client_update
+    ):
+        parser.error("--resume replays the journaled clients; drop the client options")
+
+    # Load config
+    if not args.config.exists():
+        print(f"Error: Config file not found: {args.config}")
+        sys.exit(1)
+
+    config = load_config(args.config)
+
+    # Skip before any network access (or key decryption) if nothing changed.
+    # Explicit client options always sync, since they aren't part of the digest.
+    sync_state = None
+    source_digest = None
+    if args.command == "sync":
+        if not args.resources.exists():
+            print(f"Error: Resources file not found: {args.resources}")
+            sys.exit(1)
+        sync_state = load_sync_state(args.state_file)
+        source_digest = compute_source_digest(args.resources, args.config)
+        site_state = sync_state["sites"].get(config["site_name"], {})
+        journal = SyncJournal(journal_path(args.journal_dir, config["site_name"]))
+        if args.resume and journal.outstanding() is None:
+            print("No interrupted sync to resume")
+            sys.exit(0)
+        if (
+            args.if_changed
+            and not args.resume
+            and not args.clients
+            and not args.force_client_update
+            and site_state.get("source_digest") == source_digest
+        ):
+            print(f"Local inputs unchanged since last sync ({source_digest[:19]}) - skipping")
+            sys.exit(0)
 
     # Get API key (env var takes precedence, then SOPS file)
     api_key = os.environ.get("PANGOLIN_API_KEY")
@@ -734,12 +999,6 @@ def main():
         print("  3. Use --token-file to specify a different file")
         sys.exit(1)
 
-    # Load config
-    if not args.config.exists():
-        print(f"Error: Config file not found: {args.config}")
-        sys.exit(1)
-
-    config = load_config(args.config)
     client = PangolinClient(api_key, config.get("pangolin_url", "https://pangolin.home-infra.net"))
 
     # Execute command
@@ -748,16 +1007,28 @@ def main():
     elif args.command == "list-clients":
         sys.exit(cmd_list_clients(client, config))
     elif args.command == "sync":
-        if not args.resources.exists():
-            print(f"Error: Resources file not found: {args.resources}")
-            sys.exit(1)
         resources = load_resources(args.resources)
-        sys.exit(cmd_sync(client, config, resources, args.dry_run, args.clients, args.no_default_clients, args.force_client_update))
+        result = cmd_sync(
+            client, config, resources, args.dry_run, args.clients, args.no_default_clients,
+            args.force_client_update, journal, args.resume,
+        )
+        if result == 0 and not args.dry_run and not args.clients and not args.no_default_clients:
+            sync_state["sites"][config["site_name"]] = {
+                "source_digest": source_digest,
+                "synced_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            }
+            save_sync_state(args.state_file, sync_state)
+        sys.exit(result)
     elif args.command == "purge":
         if not args.dry_run and not args.confirm:
             print("Error: Purge requires --confirm flag (or use --dry-run to preview)")
             print("Usage: ./pangolin-resources.py purge --confirm")
             sys.exit(1)
+        if not args.dry_run:
+            # Remote state no longer matches the last sync
+            sync_state = load_sync_state(args.state_file)
+            if sync_state["sites"].pop(config["site_name"], None) is not None:
+                save_sync_state(args.state_file, sync_state)
         sys.exit(cmd_purge(client, config, args.dry_run))
 
 
@@ -0,0 +1,174 @@
+"""
+Shared helpers for the ControlD and Pangolin sync scripts.
+
+Imported by scripts/controld/controld-dns.py and
+scripts/pangolin/pangolin-resources.py, which add this directory to
+sys.path: the adaptive API rate limiter and the resumable sync journal.
+"""
+
+import email.utils
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+
+
+class RateLimiter:
+    """Thread-safe token bucket that adapts to the API's rate limits.
+
+    acquire() blocks until a request may be sent. A 429 halves the rate
+    (down to min_rate) and pauses every caller until Retry-After, or a
+    jittered exponential backoff, has passed; each success then raises the
+    rate again step by step. When response headers report that the
+    remaining budget is zero, callers pause until the advertised reset.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        min_rate: float = 0.5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+    ):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+        self.throttled = 0
+
+    def acquire(self) -> None:
+        """Wait for a token (and for any active backoff) before a request."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff for attempt (0-based) with equal jitter."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def on_success(self, headers) -> None:
+        """Recover the rate and honour RateLimit-Remaining/-Reset headers."""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+            remaining = headers.get("RateLimit-Remaining") or headers.get("X-RateLimit-Remaining")
+            reset = headers.get("RateLimit-Reset") or headers.get("X-RateLimit-Reset")
+            try:
+                if remaining is not None and reset is not None and int(remaining) <= 0:
+                    reset = float(reset)
+                    # Some APIs send an epoch timestamp rather than seconds
+                    if reset > time.time() - 1:
+                        reset -= time.time()
+                    self.blocked_until = max(
+                        self.blocked_until, time.monotonic() + min(max(reset, 0), self.backoff_max)
+                    )
+            except ValueError:
+                pass
+
+    def on_rate_limited(self, headers, attempt: int) -> float:
+        """Slow down after a 429 and return how long callers will pause."""
+        delay = parse_retry_after(headers.get("Retry-After"))
+        if delay is None:
+            delay = self.backoff(attempt)
+        delay = min(delay, self.backoff_max)
+        with self.lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        return delay
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delay in seconds or an HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(when.timestamp() - time.time(), 0.0)
+
+
+class SyncJournal:
+    """Append-only record of a sync's planned and completed operations.
+
+    Each line is one JSON event: a "plan" listing every operation by action
+    and key, then "done" or "failed" events as operations finish. When a run
+    dies partway, outstanding() returns what the last plan still needs, so
+    `sync --resume` can replay just that. The file is removed once a plan
+    completes without errors.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _append(self, event: dict) -> None:
+        event["at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        line = json.dumps(event, sort_keys=True) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(line)
+
+    def plan(self, digest: str, ops: dict[str, dict], **context) -> None:
+        """Start a new plan; ops maps action -> {key: payload}."""
+        self._append({"event": "plan", "digest": digest, "ops": ops, **context})
+
+    def done(self, action: str, keys: list[str]) -> None:
+        self._append({"event": "done", "action": action, "keys": keys})
+
+    def failed(self, action: str, keys: list[str], error: Exception) -> None:
+        self._append({"event": "failed", "action": action, "keys": keys, "error": str(error)})
+
+    def outstanding(self) -> dict | None:
+        """Return the last plan minus completed operations, None if nothing is left."""
+        try:
+            lines = self.path.read_text().splitlines()
+        except OSError:
+            return None
+        plan = None
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue  # Torn final line from a killed process
+            if event.get("event") == "plan":
+                plan = event
+            elif event.get("event") == "done" and plan is not None:
+                for key in event["keys"]:
+                    plan["ops"].get(event["action"], {}).pop(key, None)
+        if plan is None or not any(plan["ops"].values()):
+            return None
+        return plan
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def journal_path(journal_dir: Path, name: str) -> Path:
+    """Journal file for a profile or site name."""
+    return journal_dir / (re.sub(r"[^A-Za-z0-9._-]", "_", name) + ".jsonl")
@@ -0,0 +1,37 @@
+"""Tests for scripts/controld/controld-dns.py.
+
+Run with: python -m pytest scripts/tests
+"""
+
+import importlib.util
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "controld" / "controld-dns.py"
+spec = importlib.util.spec_from_file_location("controld_dns", SCRIPT)
+controld_dns = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(controld_dns)
+
+
+def test_compact_never_wildcards_a_tld():
+    desired = {"a.net": "10.10.2.20", "b.net": "10.10.2.20"}
+    compacted, mismatched = controld_dns.compact_desired_state(desired, {"a.net", "b.net"})
+    assert compacted == desired
+    assert mismatched == []
+
+
+def test_compact_only_below_configured_suffixes():
+    desired = {
+        "chat.home-infra.net": "10.10.2.20",
+        "git.home-infra.net": "10.10.2.20",
+        "nas.home-infra.net": "10.10.2.5",
+        "a.other.org": "10.10.2.20",
+        "b.other.org": "10.10.2.20",
+    }
+    compacted, mismatched = controld_dns.compact_desired_state(desired, {"home-infra.net"})
+    assert compacted == {
+        "*.home-infra.net": "10.10.2.20",
+        "nas.home-infra.net": "10.10.2.5",
+        "a.other.org": "10.10.2.20",
+        "b.other.org": "10.10.2.20",
+    }
+    assert mismatched == []